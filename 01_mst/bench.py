@@ -0,0 +1,117 @@
+import argparse
+import csv
+import json
+import math
+import platform
+import time
+import tracemalloc
+
+from utils import CS33Random
+
+from kruskal import mst_cost as mst_cost_kruskal
+from kruskal_np import mst_cost as mst_cost_kruskal_np
+from kruskal_external import mst_cost as mst_cost_kruskal_external
+from prim import mst_cost as mst_cost_prim
+from prim2 import mst_cost as mst_cost_prim2
+from prim3 import mst_cost as mst_cost_prim3
+from boruvka import mst_cost as mst_cost_boruvka
+from dynamic_mst import mst_cost as mst_cost_dynamic
+
+
+# name -> (mst_cost, largest edge count to try it on)
+sols = {
+    'kruskal': (mst_cost_kruskal, math.inf),
+    'kruskal_np': (mst_cost_kruskal_np, math.inf),
+    'kruskal_external': (mst_cost_kruskal_external, math.inf),
+    'prim': (mst_cost_prim, 10**4),  # O(V*E)
+    'prim2': (mst_cost_prim2, math.inf),
+    'prim3': (mst_cost_prim3, math.inf),
+    'prim3_dense': (lambda nodes, edges: mst_cost_prim3(nodes, edges, dense=True), math.inf),
+    'boruvka': (mst_cost_boruvka, math.inf),
+    'boruvka_parallel': (lambda nodes, edges: mst_cost_boruvka(nodes, edges, parallel=True), math.inf),
+    'dynamic': (mst_cost_dynamic, 10**6),
+}
+
+
+# family -> function making a connected graph with about e edges
+families = {
+    # average degree 8
+    'sparse': lambda rand, e: rand.random_connected_graph(max(1, e // 4), e),
+    # about a quarter of all pairs
+    'dense': lambda rand, e: rand.random_connected_graph(max(1, math.isqrt(4*e)), e),
+    'grid': lambda rand, e: rand.grid_graph(max(1, math.isqrt(e // 2)), max(1, math.isqrt(e // 2))),
+    'complete': lambda rand, e: rand.complete_graph((1 + math.isqrt(1 + 8*e)) // 2),
+}
+
+
+def bench(family_names, sizes, impl_names, *, seed=33):
+    rand = CS33Random(seed)
+    for family in family_names:
+        for size in sizes:
+            edges = families[family](rand, size)
+            nodes = range(1 + max((max(edge.i, edge.j) for edge in edges), default=0))
+
+            costs = set()
+            for name in impl_names:
+                mst_cost, max_edges = sols[name]
+                if len(edges) > max_edges:
+                    continue
+
+                start = time.perf_counter()
+                cost = mst_cost(nodes, edges)
+                seconds = time.perf_counter() - start
+
+                # separate run, since tracemalloc slows everything down
+                tracemalloc.start()
+                mst_cost(nodes, edges)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+                costs.add(cost)
+                result = {
+                    'family': family,
+                    'n': len(nodes),
+                    'e': len(edges),
+                    'impl': name,
+                    'seconds': seconds,
+                    'peak_bytes': peak,
+                    'cost': cost,
+                }
+                print(result)
+                yield result
+
+            # every implementation has to agree
+            assert len(costs) <= 1, costs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="time every mst implementation on generated graphs")
+    parser.add_argument('--families', nargs='+', choices=families, default=[*families])
+    parser.add_argument('--sizes', nargs='+', type=int, default=[10**3, 10**4, 10**5],
+            help="target edge counts, up to 10**7")
+    parser.add_argument('--impls', nargs='+', choices=sols, default=[*sols])
+    parser.add_argument('--seed', type=int, default=33)
+    parser.add_argument('--json', help="write results to this JSON file")
+    parser.add_argument('--csv', help="write results to this CSV file")
+    args = parser.parse_args()
+
+    results = [*bench(args.families, args.sizes, args.impls, seed=args.seed)]
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'seed': args.seed,
+                'results': results,
+            }, f, indent=2)
+
+    if args.csv:
+        with open(args.csv, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=[*results[0]] if results else [])
+            writer.writeheader()
+            writer.writerows(results)
+
+
+if __name__ == '__main__':
+    main()
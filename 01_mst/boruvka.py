@@ -1,65 +1,167 @@
+import os
+
 from collections.abc import Iterable, Sequence
+from itertools import pairwise
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from utils import Edge, UnionFind
+from kruskal_np import edge_arrays
+
+
+def cheapest_edges(n, ci, cj):
+    # for each component, the position of the cheapest edge leaving it.
+    # edges are sorted by (cost, index), so the cheapest is the smallest position.
+    # components with no outgoing edge get len(ci)
+    pos = np.arange(len(ci))
+    best = np.full(n, len(ci), dtype=pos.dtype)
+    np.minimum.at(best, ci, pos)
+    np.minimum.at(best, cj, pos)
+    return best
+
+
+# worker side of the parallel mode. the surviving edges stay in shared
+# memory between rounds, as parallel arrays pos (position in sorted order),
+# ci and cj (components of the endpoints), and every chunk of them belongs
+# to one task per round, which relabels, filters and scans it in place
+_shared = {}
+
+def _attach(spec):
+    for key, name, size in spec:
+        shm = SharedMemory(name=name)
+        _shared[key] = shm, np.ndarray(size, dtype=np.int64, buffer=shm.buf)
+
+
+def _round_chunk(n, lo, live):
+    # one round over the chunk's live edges [lo, live): point them at the
+    # current components, compact away the internal ones, and return
+    # (new live end, components, position of their cheapest edge here)
+    pos, ci, cj, relabel = (_shared[key][1] for key in ('pos', 'ci', 'cj', 'relabel'))
+    a = relabel[ci[lo:live]]
+    b = relabel[cj[lo:live]]
+    keep = a != b
+    hi = lo + int(np.count_nonzero(keep))
+    pos[lo:hi] = pos[lo:live][keep]
+    ci[lo:hi] = a[keep]
+    cj[lo:hi] = b[keep]
+
+    best = cheapest_edges(n, ci[lo:hi], cj[lo:hi])
+    comps = np.flatnonzero(best < hi - lo)
+    return hi, comps, pos[lo + best[comps]]
+
+
+def _mst_indices_parallel(n, i, j, order, workers):
+    # the parent only reduces the per-chunk minima and does the unions, in
+    # O(n + chosen edges) a round. all the O(m) work happens in the workers
+    m = len(order)
+    if not m:
+        return
+
+    sizes = {'pos': m, 'ci': m, 'cj': m, 'relabel': n}
+    shms = {key: SharedMemory(create=True, size=max(1, size*8)) for key, size in sizes.items()}
+    views = {key: np.ndarray(sizes[key], dtype=np.int64, buffer=shm.buf) for key, shm in shms.items()}
+    try:
+        views['pos'][:] = np.arange(m)
+        views['ci'][:] = i[order]
+        views['cj'][:] = j[order]
+        views['relabel'][:] = np.arange(n)
+        relabel = views['relabel']
+
+        bounds = np.linspace(0, m, workers + 1).astype(int).tolist()
+        chunks = [[lo, hi] for lo, hi in pairwise(bounds) if lo < hi]
+
+        spec = [(key, shm.name, sizes[key]) for key, shm in shms.items()]
+        with Pool(workers, initializer=_attach, initargs=(spec,)) as pool:
+            comps = UnionFind(n)
+            while True:
+                tasks = [(n, lo, live) for lo, live in chunks if lo < live]
+                best = np.full(n, m, dtype=np.int64)
+                for chunk, (live, local_comps, local_best) in zip(
+                        (chunk for chunk in chunks if chunk[0] < chunk[1]),
+                        pool.starmap(_round_chunk, tasks)):
+                    chunk[1] = live
+                    np.minimum.at(best, local_comps, local_best)
+
+                chosen = order[np.unique(best[best < m])]
+                if not len(chosen):
+                    break
+
+                # components before this round's unions, to relabel after them
+                touched = np.unique(comps.find_many(np.concatenate((i[chosen], j[chosen])).tolist()))
+                for idx, a, b in zip(chosen.tolist(), i[chosen].tolist(), j[chosen].tolist()):
+                    if comps.union(a, b):
+                        yield idx
+                relabel[touched] = comps.find_many(touched.tolist())
+    finally:
+        views.clear()
+        for shm in shms.values():
+            shm.close()
+            shm.unlink()
+
+
+def _mst_indices_serial(n, i, j, order):
+    eidx = order
+
+    # components of the endpoints of the surviving edges
+    ci = i[eidx]
+    cj = j[eidx]
+
+    comps = UnionFind(n)
+    relabel = np.arange(n)
 
-from utils import Edge
-
-def mst_edges[T](nodes: Sequence[T], edges: Sequence[Edge]) -> Iterable[Edge]:
-
-    mst_cost = 0
-    adj = {node: [] for node in nodes}
-
-    def add_edge(edge):
-        nonlocal mst_cost
-        mst_cost += edge.cost
-        adj[edge.i].append((edge.j, edge.cost))
-        adj[edge.j].append((edge.i, edge.cost))
-
-    def get_comps():
-        comp = {}
-        comp_ct = 0
-        for s in nodes:
-            if s not in comp:
-                comp_ct += 1
-                comp[s] = s
-                stak = [s]
-                while stak:
-                    i = stak.pop()
-                    assert comp[i] == s
-                    for j, c in adj[i]:
-                        if j not in comp:
-                            comp[j] = s
-                            stak.append(j)
-                        assert comp[j] == s
-
-        return comp, comp_ct
-
-    inc = [False]*len(edges)
     while True:
+        # drop edges that have become internal to a component
+        keep = ci != cj
+        eidx, ci, cj = eidx[keep], ci[keep], cj[keep]
 
-        # get components
-        comp, comp_ct = get_comps()
-
-        if comp_ct <= 1:
+        if not len(eidx):
             break
 
-        # get minimum edge away from each component, tie-break by edge index
-        min_edge = {node: (float('inf'), None) for node in nodes}
+        # get minimum edge away from each component
+        best = cheapest_edges(n, ci, cj)
+        chosen = np.unique(best[best < len(eidx)])
+
+        for a, b, idx in zip(ci[chosen].tolist(), cj[chosen].tolist(), eidx[chosen].tolist()):
+            if comps.union(a, b):
+                yield idx
+
+        # contract: point the merged components at their new representative
+        touched = np.unique(np.concatenate((ci[chosen], cj[chosen])))
+        relabel[touched] = comps.find_many(touched.tolist())
+        ci = relabel[ci]
+        cj = relabel[cj]
+
+
+def mst_edge_indices(n: int, i, j, cost, *, parallel: bool = False, workers: int | None = None) -> Iterable[int]:
+    # boruvka on a columnar edge set over nodes 0..n-1, yielding the indices
+    # of the chosen edges, so big inputs never need Edge objects.
+    #
+    # parallel=True or workers=N runs each round's relabel, filter and
+    # cheapest-edge scan across a process pool, on edges kept in shared
+    # memory. the MST is the same, since the (cost, index) order is.
+    i = np.asarray(i, dtype=np.int64)
+    j = np.asarray(j, dtype=np.int64)
+
+    # sort once by cost, tie-break by edge index
+    order = np.argsort(cost, kind='stable')
 
-        for idx, edge in enumerate(edges):
-            if comp[edge.i] != comp[edge.j]:
-                min_edge[comp[edge.i]] = min(min_edge[comp[edge.i]], (edge.cost, idx))
-                min_edge[comp[edge.j]] = min(min_edge[comp[edge.j]], (edge.cost, idx))
+    if parallel or workers is not None:
+        yield from _mst_indices_parallel(n, i, j, order, workers or os.cpu_count())
+    else:
+        yield from _mst_indices_serial(n, i, j, order)
 
-        for c, idx in min_edge.values():
-            if idx is not None and not inc[idx]:
-                inc[idx] = True
-                add_edge(edges[idx])
-                yield edges[idx]
 
-    return mst_cost
+def mst_edges[T](nodes: Sequence[T], edges: Sequence[Edge], *, parallel: bool = False, workers: int | None = None) -> Iterable[Edge]:
+    # adapter for the Edge-based generator API
+    i, j, cost = edge_arrays(nodes, edges)
+    for idx in mst_edge_indices(len(nodes), i, j, cost, parallel=parallel, workers=workers):
+        yield edges[idx]
 
 
-def mst_cost[T](nodes: Sequence[T], edges: Sequence[Edge]) -> int:
-    return sum(edge.cost for edge in mst_edges(nodes, edges))
+def mst_cost[T](nodes: Sequence[T], edges: Sequence[Edge], *, parallel: bool = False, workers: int | None = None) -> int:
+    return sum(edge.cost for edge in mst_edges(nodes, edges, parallel=parallel, workers=workers))
 
 
 assert mst_cost(range(5), [
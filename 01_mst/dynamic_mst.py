@@ -0,0 +1,289 @@
+from collections.abc import Sequence, Iterable
+
+from dataclasses import replace
+
+from utils import Edge
+
+INF = float('inf')
+
+
+class LinkCutTree:
+    # link-cut tree over the nodes 0, 1, 2, ... with a value on each node.
+    # each preferred path is a splay tree keyed by depth; top[x] is the node with
+    # the largest value in the splay subtree of x, which gives path maximums.
+    # evert (make x the root) is a lazy flip of the splay tree.
+    # all operations are O(log n) amortized.
+    def __init__(self):
+        self.left = []
+        self.right = []
+        self.parent = []
+        self.flip = []
+        self.val = []
+        self.top = []
+        super().__init__()
+
+    def add_node(self, val):
+        x = len(self.val)
+        self.left.append(-1)
+        self.right.append(-1)
+        self.parent.append(-1)
+        self.flip.append(False)
+        self.val.append(val)
+        self.top.append(x)
+        return x
+
+    def _is_root(self, x):
+        # is x the root of its splay tree?
+        p = self.parent[x]
+        return p < 0 or self.left[p] != x and self.right[p] != x
+
+    def _push(self, x):
+        if self.flip[x]:
+            self.flip[x] = False
+            l = self.left[x]
+            r = self.right[x]
+            self.left[x], self.right[x] = r, l
+            if l >= 0:
+                self.flip[l] = not self.flip[l]
+            if r >= 0:
+                self.flip[r] = not self.flip[r]
+
+    def _pull(self, x):
+        val, top = self.val, self.top
+        best = x
+        for c in self.left[x], self.right[x]:
+            if c >= 0 and val[top[c]] > val[best]:
+                best = top[c]
+        top[x] = best
+
+    def _rotate(self, x):
+        left, right, parent = self.left, self.right, self.parent
+        p = parent[x]
+        g = parent[p]
+        if not self._is_root(p):
+            if left[g] == p:
+                left[g] = x
+            else:
+                right[g] = x
+        parent[x] = g
+
+        if left[p] == x:
+            b = right[x]
+            left[p] = b
+            right[x] = p
+        else:
+            b = left[x]
+            right[p] = b
+            left[x] = p
+        if b >= 0:
+            parent[b] = p
+        parent[p] = x
+
+        self._pull(p)
+        self._pull(x)
+
+    def _splay(self, x):
+        left, right, parent = self.left, self.right, self.parent
+
+        def is_root(x):
+            p = parent[x]
+            return p < 0 or left[p] != x and right[p] != x
+
+        # push pending flips down from the splay root first
+        path = [x]
+        while not is_root(path[-1]):
+            path.append(parent[path[-1]])
+        for y in reversed(path):
+            if self.flip[y]:
+                self._push(y)
+
+        while not is_root(x):
+            p = parent[x]
+            if not is_root(p):
+                g = parent[p]
+                zigzig = (left[g] == p) == (left[p] == x)
+                self._rotate(p if zigzig else x)
+            self._rotate(x)
+
+    def _access(self, x):
+        # make the root..x path preferred, and splay x to the top of it
+        last = -1
+        y = x
+        while y >= 0:
+            self._splay(y)
+            self.right[y] = last
+            self._pull(y)
+            last = y
+            y = self.parent[y]
+        self._splay(x)
+
+    def evert(self, x):
+        self._access(x)
+        self.flip[x] = not self.flip[x]
+
+    def find_root(self, x):
+        self._access(x)
+        while True:
+            self._push(x)
+            if self.left[x] < 0:
+                break
+            x = self.left[x]
+        self._splay(x)
+        return x
+
+    def connected(self, x, y):
+        self.evert(x)
+        return self.find_root(y) == x
+
+    def link(self, x, y):
+        # x and y must be in different trees
+        self.evert(x)
+        self.parent[x] = y
+
+    def cut(self, x, y):
+        # x and y must be adjacent
+        self.evert(x)
+        self._access(y)
+        assert self.left[y] == x and self.right[x] < 0
+        self.left[y] = -1
+        self.parent[x] = -1
+        self._pull(y)
+
+    def path_max(self, x, y):
+        # the node with the largest value on the path from x to y
+        self.evert(x)
+        self._access(y)
+        return self.top[y]
+
+    def set_val(self, x, val):
+        self._access(x)
+        self.val[x] = val
+        self._pull(x)
+
+
+class IncrementalMST[T]:
+    # minimum spanning forest under edge insertions and weight decreases.
+    # every edge is also a node of a link-cut tree (the nodes have value -inf),
+    # so the heaviest edge on the cycle a new edge closes is a path maximum.
+    # updates are O(log(V + E)) amortized, and the current cost is self.cost.
+    def __init__(self, nodes: Sequence[T], edges: Iterable[Edge] = ()):
+        self.nodes = nodes
+        if isinstance(nodes, range) and nodes == range(len(nodes)):
+            self.index = None
+        else:
+            self.index = {node: idx for idx, node in enumerate(nodes)}
+
+        self.lct = LinkCutTree()
+        for _ in nodes:
+            self.lct.add_node(-INF)
+
+        self.edges: list[Edge] = []
+        self.in_tree: list[bool] = []
+        self.cost = 0
+
+        for edge in edges:
+            self.insert_edge(edge)
+
+        super().__init__()
+
+    def _idx(self, i):
+        return i if self.index is None else self.index[i]
+
+    def _node(self, edge_idx):
+        return len(self.nodes) + edge_idx
+
+    def insert_edge(self, edge: Edge) -> int:
+        # returns the id of the edge, for decrease_weight
+        edge_idx = len(self.edges)
+        self.edges.append(edge)
+        self.in_tree.append(False)
+        self.lct.add_node(edge.cost)
+        self._offer(edge_idx)
+        return edge_idx
+
+    def decrease_weight(self, edge_idx: int, cost: int):
+        # the Edge is replaced by a copy with the new cost, the caller's is untouched
+        edge = self.edges[edge_idx]
+        if cost > edge.cost:
+            raise ValueError(f"can't increase the weight of {edge} to {cost}")
+
+        self.edges[edge_idx] = replace(edge, cost=cost)
+        self.lct.set_val(self._node(edge_idx), cost)
+
+        if self.in_tree[edge_idx]:
+            self.cost -= edge.cost - cost
+        else:
+            self._offer(edge_idx)
+
+    def _offer(self, edge_idx):
+        # add the edge to the forest if it joins two trees, or if it is
+        # cheaper than the heaviest edge on the cycle it closes
+        edge = self.edges[edge_idx]
+        i = self._idx(edge.i)
+        j = self._idx(edge.j)
+        if i == j:
+            return
+
+        if not self.lct.connected(i, j):
+            self._link(edge_idx)
+        else:
+            heaviest = self.lct.path_max(i, j)
+            if self.lct.val[heaviest] > edge.cost:
+                self._cut(heaviest - len(self.nodes))
+                self._link(edge_idx)
+
+    def _link(self, edge_idx):
+        edge = self.edges[edge_idx]
+        x = self._node(edge_idx)
+        self.lct.link(self._idx(edge.i), x)
+        self.lct.link(x, self._idx(edge.j))
+        self.in_tree[edge_idx] = True
+        self.cost += edge.cost
+
+    def _cut(self, edge_idx):
+        edge = self.edges[edge_idx]
+        x = self._node(edge_idx)
+        self.lct.cut(self._idx(edge.i), x)
+        self.lct.cut(x, self._idx(edge.j))
+        self.in_tree[edge_idx] = False
+        self.cost -= edge.cost
+
+    def mst_edges(self) -> Iterable[Edge]:
+        return (edge for edge, in_tree in zip(self.edges, self.in_tree) if in_tree)
+
+
+def mst_edges[T](nodes: Sequence[T], edges: Sequence[Edge]) -> Iterable[Edge]:
+    return IncrementalMST(nodes, edges).mst_edges()
+
+
+def mst_cost[T](nodes: Sequence[T], edges: Sequence[Edge]) -> int:
+    return IncrementalMST(nodes, edges).cost
+
+
+assert mst_cost(range(5), [
+        Edge(0, 1, 4),
+        Edge(1, 2, 2),
+        Edge(0, 2, 4),
+        Edge(0, 3, 6),
+        Edge(2 ,3, 8),
+        Edge(0, 4, 6),
+        Edge(3, 4, 9),
+    ]) == 18
+
+if __name__ == '__main__':
+    mst = IncrementalMST(range(5), [
+            Edge(0, 1, 4),
+            Edge(1, 2, 2),
+            Edge(0, 2, 4),
+            Edge(0, 3, 6),
+            Edge(2 ,3, 8),
+            Edge(0, 4, 6),
+            Edge(3, 4, 9),
+        ])
+    print(mst.cost)
+    mst.decrease_weight(6, 1)
+    print(mst.cost)
+    mst.insert_edge(Edge(2, 4, 0))
+    print(mst.cost)
+    for edge in mst.mst_edges():
+        print(edge)
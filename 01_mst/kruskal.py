@@ -1,65 +1,120 @@
+from array import array
 from collections.abc import Sequence, Iterable
 
-from utils import Edge
+from utils import Edge, UnionFind
 
 
 class ConnectedComponents[T]:
+    # maps arbitrary hashable node labels onto the dense indices of a UnionFind
     def __init__(self, nodes: Sequence[T]):
-        # self.comps: list[set[T]] = [{i} for i in nodes]
-        self.parent = {node: node for node in nodes}
-        self.weight = {node: 1 for node in nodes}
+        self.nodes = nodes
+        if isinstance(nodes, range) and nodes == range(len(nodes)):
+            # labels are already 0..n-1, so skip the label -> index dict
+            self.index = None
+        else:
+            self.index = {node: idx for idx, node in enumerate(nodes)}
+        self.uf = UnionFind(len(nodes))
         super().__init__()
 
+    @property
+    def comps(self):
+        return self.uf.comps
+
+    def _idx(self, i):
+        return i if self.index is None else self.index[i]
+
     def find(self, i):
-        # return next(idx for idx, comp in enumerate(self.comps) if i in comp)
-        if self.parent[i] == i:
-            return i
-        else:
-            self.parent[i] = self.find(self.parent[i])
-            return self.parent[i]
+        return self.nodes[self.uf.find(self._idx(i))]
 
     def union(self, i, j):
         # returns True if union is successful, false otherwise
-        i = self.find(i)
-        j = self.find(j)
-        if i == j:
-            return False
-
-        # union by weight
+        return self.uf.union(self._idx(i), self._idx(j))
 
-        # make j the larger tree
-        if self.weight[i] > self.weight[j]:
-            i, j = j, i
+    def find_many(self, nodes):
+        # representatives as labels, like find
+        return [self.nodes[root] for root in self.find_many_idx(nodes)]
 
-        # j is now the larger tree (or equal)
-        assert self.weight[i] <= self.weight[j]
+    def find_many_idx(self, nodes):
+        # representatives as dense indices into self.nodes
+        if self.index is not None:
+            nodes = map(self.index.__getitem__, nodes)
+        return self.uf.find_many(nodes)
 
-        self.parent[i] = j
-        self.weight[j] += self.weight[i]
+    def union_many(self, pairs):
+        if self.index is not None:
+            index = self.index
+            pairs = ((index[i], index[j]) for i, j in pairs)
+        return self.uf.union_many(pairs)
 
-        return True
+    def labels(self):
+        # dense component label of every node, numbered in order of first appearance
+        label = {}
+        return array('i', [label.setdefault(root, len(label)) for root in self.uf.find_many(range(len(self.nodes)))])
 
 
 def mst_edges[T](nodes: Sequence[T], edges: Sequence[Edge]) -> Iterable[Edge]:
     # sort the edges in increasing order of weight. (break ties arbitrarily)
+    # on disconnected input, this gives a minimum spanning forest
 
     comps = ConnectedComponents(nodes)
 
-    edges_chosen = []
     for edge in sorted(edges, key=lambda edge: edge.cost):
+        if comps.comps <= 1:
+            # spanning tree is complete, the remaining edges can't be chosen
+            break
+
         if comps.union(edge.i, edge.j):
-            edges_chosen.append(edge)
             yield edge
 
-        # # verify if you want
-        # assert connected_components(nodes, edges) == connected_components(nodes, edges_chosen)
-
-
 
 def mst_cost[T](nodes: Sequence[T], edges: Sequence[Edge]) -> int:
     return sum(edge.cost for edge in mst_edges(nodes, edges))
 
 
+def single_linkage[T](nodes: Sequence[T], edges: Sequence[Edge], k: int = 1):
+    # single-linkage clustering: kruskal, stopping once there are k components
+    # (or the edges run out). returns (labels, dendrogram):
+    #
+    # labels[idx] is the cluster of nodes[idx], numbered 0, 1, 2, ...
+    #
+    # dendrogram has one (a, b, height, size) row per union, in union order.
+    # clusters 0..n-1 are the single nodes, and row t makes cluster n + t out
+    # of clusters a and b, at merge height `height`, with `size` nodes.
+    # this is the same layout as scipy's linkage matrix.
+    n = len(nodes)
+    comps = ConnectedComponents(nodes)
+    uf = comps.uf
+
+    # cluster id of each union-find root
+    cluster = array('i', range(n))
+
+    dendrogram = []
+    for edge in sorted(edges, key=lambda edge: edge.cost):
+        if comps.comps <= k:
+            break
+
+        i = uf.find(comps._idx(edge.i))
+        j = uf.find(comps._idx(edge.j))
+        if uf.union(i, j):
+            root = uf.find(i)
+            dendrogram.append((cluster[i], cluster[j], edge.cost, uf.size[root]))
+            cluster[root] = n + len(dendrogram) - 1
+
+    return comps.labels(), dendrogram
+
+
+def labels_from_dendrogram(n: int, dendrogram, k: int):
+    # the labels single_linkage(..., k) would give, from a dendrogram computed
+    # once with k=1. replays the first n - k unions.
+    uf = UnionFind(n + len(dendrogram))
+    for t, (a, b, height, size) in enumerate(dendrogram[:max(0, n - k)]):
+        uf.union(a, n + t)
+        uf.union(b, n + t)
+
+    label = {}
+    return array('i', [label.setdefault(root, len(label)) for root in uf.find_many(range(n))])
+
+
 assert mst_cost(range(5), [
         Edge(0, 1, 4),
         Edge(1, 2, 2),
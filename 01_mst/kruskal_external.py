@@ -0,0 +1,179 @@
+import os
+import struct
+import tempfile
+
+from numbers import Integral
+
+from collections.abc import Sequence, Iterable
+from contextlib import closing
+from heapq import merge
+from itertools import batched
+
+from utils import Edge
+from kruskal import ConnectedComponents
+
+
+# edge file format: one little-endian (i, j, cost) record per edge, with
+# integer costs only
+RECORD = struct.Struct('<iiq')
+
+# sorted run format: (cost, edge index, i, j), so runs merge in the same
+# order as a stable sort by cost. i and j are dense node indices, and cost
+# is an int64. runs with any non-integer cost store it as a float64, plus
+# a flag and the exact value for the integer ones, so they come back as ints
+_RUN_RECORD = struct.Struct('<qqii')
+_FLOAT_RUN_RECORD = struct.Struct('<dqii?q')
+
+# rough size of one (cost, idx, i, j) tuple in memory
+_BYTES_PER_EDGE = 200
+
+# records read or written at a time
+_BUFFER_EDGES = 1 << 12
+
+
+def write_edges(path, edges: Iterable[Edge]):
+    with open(path, 'wb') as f:
+        for chunk in batched(edges, _BUFFER_EDGES):
+            for edge in chunk:
+                if not isinstance(edge.cost, Integral):
+                    raise TypeError(f"edge files hold integer costs only, not {edge.cost!r} in {edge}")
+            f.write(b''.join(RECORD.pack(edge.i, edge.j, edge.cost) for edge in chunk))
+
+
+def read_edges(path) -> Iterable[Edge]:
+    for i, j, cost in _read_records(path, RECORD):
+        yield Edge(i, j, cost)
+
+
+def _read_records(path, record):
+    with open(path, 'rb') as f:
+        while data := f.read(record.size * _BUFFER_EDGES):
+            yield from record.iter_unpack(data)
+
+
+def _pack_float(cost, idx, i, j):
+    integral = isinstance(cost, Integral)
+    return _FLOAT_RUN_RECORD.pack(cost, idx, i, j, integral, cost if integral else 0)
+
+
+def _read_run(path, record):
+    # (cost, idx, i, j) tuples, with each cost of the type it was spilled as
+    records = _read_records(path, record)
+    if record is _RUN_RECORD:
+        return records
+    return ((exact if integral else cost, idx, i, j) for cost, idx, i, j, integral, exact in records)
+
+
+def _spill(dirname, run, record):
+    # returns the run as (path, record format)
+    pack = record.pack if record is _RUN_RECORD else _pack_float
+    fd, path = tempfile.mkstemp(dir=dirname, suffix='.run')
+    with os.fdopen(fd, 'wb') as f:
+        for chunk in batched(run, _BUFFER_EDGES):
+            f.write(b''.join(pack(*rec) for rec in chunk))
+    return path, record
+
+
+def _spill_sorted(dirname, run):
+    integral = all(isinstance(cost, Integral) for cost, *_ in run)
+    return _spill(dirname, run, _RUN_RECORD if integral else _FLOAT_RUN_RECORD)
+
+
+def _merge_runs(runs):
+    return merge(*(_read_run(path, record) for path, record in runs))
+
+
+def _sorted_edges(records, memory_limit, tmpdir):
+    # external merge sort of (i, j, cost) records into (cost, idx, i, j) order.
+    # a run holds half the budget, since the next one is read before the first
+    # is known to be the last
+    run_edges = max(1, memory_limit // (2 * _BYTES_PER_EDGE))
+    chunks = batched(enumerate(records), run_edges)
+
+    run = sorted((cost, idx, i, j) for idx, (i, j, cost) in next(chunks, ()))
+    chunk = next(chunks, None)
+    if chunk is None:
+        # everything fit in memory, no need to spill
+        yield from run
+        return
+
+    with tempfile.TemporaryDirectory(dir=tmpdir) as dirname:
+        runs = [_spill_sorted(dirname, run)]
+        del run
+
+        while chunk is not None:
+            runs.append(_spill_sorted(dirname, sorted((cost, idx, i, j) for idx, (i, j, cost) in chunk)))
+            chunk = next(chunks, None)
+
+        # k-way merge, with as many runs at once as there are read buffers in the budget.
+        # if there are too many runs, merge them into fewer, longer runs first
+        fan_in = max(2, memory_limit // (_BYTES_PER_EDGE * _BUFFER_EDGES))
+        while len(runs) > fan_in:
+            merged = []
+            for group in batched(runs, fan_in):
+                integral = all(record is _RUN_RECORD for _, record in group)
+                merged.append(_spill(dirname, _merge_runs(group), _RUN_RECORD if integral else _FLOAT_RUN_RECORD))
+                for path, _ in group:
+                    os.remove(path)
+            runs = merged
+
+        yield from _merge_runs(runs)
+
+
+def mst_edges[T](nodes: Sequence[T], edges: Iterable[Edge] | str | os.PathLike, *, memory_limit: int = 1 << 26, tmpdir=None) -> Iterable[Edge]:
+    # kruskal over an edge stream that may not fit in memory: edges is either
+    # an iterable of Edge, or the path of a file written by write_edges.
+    # sorting uses about memory_limit bytes, spilling sorted runs to tmpdir,
+    # on top of the O(V) union-find. ties are broken by edge index, like kruskal.py.
+    # chosen edges are yielded as new Edge objects.
+    #
+    # nodes can be any labels, they're sorted as dense indices. costs can be
+    # ints or floats, and come back as they went in, whatever memory_limit is.
+    comps = ConnectedComponents(nodes)
+
+    if isinstance(edges, (str, os.PathLike)):
+        records = _read_records(edges, RECORD)
+    else:
+        records = ((edge.i, edge.j, edge.cost) for edge in edges)
+    if comps.index is not None:
+        index = comps.index
+        records = ((index[i], index[j], cost) for i, j, cost in records)
+
+    with closing(_sorted_edges(records, memory_limit, tmpdir)) as sorted_edges:
+        for cost, idx, i, j in sorted_edges:
+            if comps.comps <= 1:
+                break
+
+            if comps.uf.union(i, j):
+                yield Edge(nodes[i], nodes[j], cost)
+
+
+def mst_cost[T](nodes: Sequence[T], edges: Iterable[Edge] | str | os.PathLike, *, memory_limit: int = 1 << 26, tmpdir=None) -> int:
+    return sum(edge.cost for edge in mst_edges(nodes, edges, memory_limit=memory_limit, tmpdir=tmpdir))
+
+
+for memory_limit in 1 << 26, 1000:
+    assert mst_cost(range(5), [
+            Edge(0, 1, 4),
+            Edge(1, 2, 2),
+            Edge(0, 2, 4),
+            Edge(0, 3, 6),
+            Edge(2 ,3, 8),
+            Edge(0, 4, 6),
+            Edge(3, 4, 9),
+        ], memory_limit=memory_limit) == 18
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as dirname:
+        path = os.path.join(dirname, 'edges.bin')
+        write_edges(path, [
+                Edge(0, 1, 4),
+                Edge(1, 2, 2),
+                Edge(0, 2, 4),
+                Edge(0, 3, 6),
+                Edge(2 ,3, 8),
+                Edge(0, 4, 6),
+                Edge(3, 4, 9),
+            ])
+        for edge in mst_edges(range(5), path, memory_limit=1000):
+            print(edge)
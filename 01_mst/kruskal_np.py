@@ -0,0 +1,66 @@
+from collections.abc import Sequence, Iterable
+
+import numpy as np
+
+from utils import Edge, UnionFind
+
+
+def edge_arrays[T](nodes: Sequence[T], edges: Sequence[Edge]):
+    # columnar edge set: three parallel arrays i, j, cost, with node labels
+    # replaced by their dense index in nodes
+    if isinstance(nodes, range) and nodes == range(len(nodes)):
+        i = np.fromiter((edge.i for edge in edges), dtype=np.int64, count=len(edges))
+        j = np.fromiter((edge.j for edge in edges), dtype=np.int64, count=len(edges))
+    else:
+        index = {node: idx for idx, node in enumerate(nodes)}
+        i = np.fromiter((index[edge.i] for edge in edges), dtype=np.int64, count=len(edges))
+        j = np.fromiter((index[edge.j] for edge in edges), dtype=np.int64, count=len(edges))
+    cost = np.array([edge.cost for edge in edges])
+    return i, j, cost
+
+
+def mst_edge_indices(n: int, i, j, cost) -> Iterable[int]:
+    # kruskal on a columnar edge set over nodes 0..n-1. yields the indices of
+    # the chosen edges in increasing order of cost. the sort is stable, so ties
+    # are broken by edge index, same as sorted() in kruskal.py
+    i = np.asarray(i, dtype=np.int64)
+    j = np.asarray(j, dtype=np.int64)
+    order = np.argsort(cost, kind='stable')
+
+    uf = UnionFind(n)
+    for idx, a, b in zip(order.tolist(), i[order].tolist(), j[order].tolist()):
+        if uf.comps <= 1:
+            break
+
+        if uf.union(a, b):
+            yield idx
+
+
+def mst_edges[T](nodes: Sequence[T], edges: Sequence[Edge]) -> Iterable[Edge]:
+    # adapter for the Edge-based generator API
+    i, j, cost = edge_arrays(nodes, edges)
+    for idx in mst_edge_indices(len(nodes), i, j, cost):
+        yield edges[idx]
+
+
+def mst_cost[T](nodes: Sequence[T], edges: Sequence[Edge]) -> int:
+    return sum(edge.cost for edge in mst_edges(nodes, edges))
+
+
+assert mst_cost(range(5), [
+        Edge(0, 1, 4),
+        Edge(1, 2, 2),
+        Edge(0, 2, 4),
+        Edge(0, 3, 6),
+        Edge(2 ,3, 8),
+        Edge(0, 4, 6),
+        Edge(3, 4, 9),
+    ]) == 18
+
+if __name__ == '__main__':
+    for idx in mst_edge_indices(5,
+            np.array([0, 1, 0, 0, 2, 0, 3]),
+            np.array([1, 2, 2, 3, 3, 4, 4]),
+            np.array([4, 2, 4, 6, 8, 6, 9]),
+        ):
+        print(idx)
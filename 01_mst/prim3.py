@@ -0,0 +1,105 @@
+from collections.abc import Sequence, Iterable
+
+from heapq import heappush, heappop
+
+from utils import Edge, CSRGraph, IndexedHeap
+
+
+def mst_edges[T](nodes: Sequence[T], edges: Sequence[Edge], *, dense: bool = False) -> Iterable[Edge]:
+    # prim, from a binary heap over a CSR adjacency built once.
+    # ties are broken by edge index.
+    #
+    # lazy (default): push every edge leaving the tree, skip stale ones when
+    # popped. O(E log E), best on sparse graphs.
+    #
+    # dense: keep one heap entry per node with decrease-key, so the heap never
+    # holds more than V entries. O(E log V).
+    if not nodes:
+        return
+
+    n = len(nodes)
+    if isinstance(nodes, range) and nodes == range(n):
+        i = [edge.i for edge in edges]
+        j = [edge.j for edge in edges]
+    else:
+        index = {node: idx for idx, node in enumerate(nodes)}
+        i = [index[edge.i] for edge in edges]
+        j = [index[edge.j] for edge in edges]
+    graph = CSRGraph.from_arrays(n, i, j, [edge.cost for edge in edges], edges=edges)
+
+    if dense:
+        yield from _mst_edges_dense(n, edges, graph)
+    else:
+        yield from _mst_edges_lazy(n, edges, graph)
+
+
+def _mst_edges_lazy(n, edges, graph: CSRGraph):
+    indptr, indices, weights, edge_id = graph.indptr, graph.indices, graph.weights, graph.edge_id
+    visited = bytearray(n)
+
+    # (cost, edge index, node), start from node 0
+    pq = [(0, -1, 0)]
+
+    while pq:
+        cost, idx, i = heappop(pq)
+
+        if visited[i]:
+            continue
+
+        visited[i] = True
+        if idx >= 0:
+            yield edges[idx]
+
+        for k in range(indptr[i], indptr[i + 1]):
+            j = indices[k]
+            if not visited[j]:
+                heappush(pq, (weights[k], edge_id[k], j))
+
+
+def _mst_edges_dense(n, edges, graph: CSRGraph):
+    indptr, indices, weights, edge_id = graph.indptr, graph.indices, graph.weights, graph.edge_id
+    visited = bytearray(n)
+
+    # key of a node is (cost, edge index) of the cheapest edge reaching it from the tree
+    pq = IndexedHeap(n)
+    pq.push(0, (0, -1))
+
+    while pq:
+        (cost, idx), i = pq.pop()
+
+        visited[i] = True
+        if idx >= 0:
+            yield edges[idx]
+
+        for k in range(indptr[i], indptr[i + 1]):
+            j = indices[k]
+            if not visited[j]:
+                pq.push(j, (weights[k], edge_id[k]))
+
+
+def mst_cost[T](nodes: Sequence[T], edges: Sequence[Edge], *, dense: bool = False) -> int:
+    return sum(edge.cost for edge in mst_edges(nodes, edges, dense=dense))
+
+
+for dense in False, True:
+    assert mst_cost(range(5), [
+            Edge(0, 1, 4),
+            Edge(1, 2, 2),
+            Edge(0, 2, 4),
+            Edge(0, 3, 6),
+            Edge(2 ,3, 8),
+            Edge(0, 4, 6),
+            Edge(3, 4, 9),
+        ], dense=dense) == 18
+
+if __name__ == '__main__':
+    for edge in mst_edges(range(5), [
+            Edge(0, 1, 4),
+            Edge(1, 2, 2),
+            Edge(0, 2, 4),
+            Edge(0, 3, 6),
+            Edge(2 ,3, 8),
+            Edge(0, 4, 6),
+            Edge(3, 4, 9),
+        ]):
+        print(edge)
@@ -2,10 +2,14 @@ from random import Random
 
 from utils import Edge, shuffled
 
-from kruskal import mst_cost as mst_cost_kruskal
+from kruskal import ConnectedComponents, mst_cost as mst_cost_kruskal, mst_edges as mst_edges_kruskal, single_linkage, labels_from_dendrogram
+from kruskal_np import mst_cost as mst_cost_kruskal_np, mst_edges as mst_edges_kruskal_np, edge_arrays, mst_edge_indices as mst_edge_indices_kruskal_np
 from prim import mst_cost as mst_cost_prim
 from prim2 import mst_cost as mst_cost_prim2
-from boruvka import mst_cost as mst_cost_boruvka
+from prim3 import mst_cost as mst_cost_prim3
+from kruskal_external import mst_edges as mst_edges_kruskal_external
+from dynamic_mst import IncrementalMST
+from boruvka import mst_cost as mst_cost_boruvka, mst_edges as mst_edges_boruvka, mst_edge_indices as mst_edge_indices_boruvka
 
 
 def main():
@@ -49,13 +53,80 @@ def main():
         #     print('    edge:', edge)
 
         cost_kruskal = mst_cost_kruskal(nodes, edges)
+        cost_kruskal_np = mst_cost_kruskal_np(nodes, edges)
         cost_prim = mst_cost_prim(nodes, edges)
         cost_prim2 = mst_cost_prim2(nodes, edges)
+        cost_prim3 = mst_cost_prim3(nodes, edges)
+        cost_prim3_dense = mst_cost_prim3(nodes, edges, dense=True)
         cost_boruvka = mst_cost_boruvka(nodes, edges)
 
-        print("The mst cost is", cost_kruskal, cost_prim, cost_prim2, cost_boruvka)
-
-        assert cost_kruskal == cost_prim == cost_prim2 == cost_boruvka
+        print("The mst cost is", cost_kruskal, cost_kruskal_np, cost_prim, cost_prim2, cost_prim3, cost_prim3_dense, cost_boruvka)
+
+        assert cost_kruskal == cost_kruskal_np == cost_prim == cost_prim2 == cost_prim3 == cost_prim3_dense == cost_boruvka
+
+        # same stable tie-break, so the exact same edges
+        assert [*mst_edges_kruskal(nodes, edges)] == [*mst_edges_kruskal_np(nodes, edges)]
+
+        # small memory limit, to spill several sorted runs and merge them in more than one pass
+        assert [*mst_edges_kruskal(nodes, edges)] == [*mst_edges_kruskal_external(nodes, edges, memory_limit=rand.randint(1, 3000))]
+
+        # same with labelled nodes and some float costs, spilling on a tiny budget
+        names = [f'v{node}' for node in nodes]
+        named_edges = [Edge(f'v{edge.i}', f'v{edge.j}', edge.cost + rand.choice([0, 0.5])) for edge in edges]
+        def typed(mst):
+            return [(edge.i, edge.j, edge.cost, type(edge.cost)) for edge in mst]
+
+        assert typed(mst_edges_kruskal(names, named_edges)) == typed(mst_edges_kruskal_external(names, named_edges, memory_limit=rand.randint(1, 3000)))
+
+        # same (cost, index) order, so boruvka finds the same tree as kruskal
+        def edge_ids(mst):
+            return sorted(map(id, mst))
+
+        assert edge_ids(mst_edges_kruskal(nodes, edges)) == edge_ids(mst_edges_boruvka(nodes, edges))
+
+        # spinning up a process pool is slow, so only check the parallel mode sometimes
+        if cas % 1000 == 0:
+            assert edge_ids(mst_edges_kruskal(nodes, edges)) == edge_ids(mst_edges_boruvka(nodes, edges, workers=3))
+
+        # the columnar entry points pick the same edge indices
+        columns = edge_arrays(nodes, edges)
+        assert sorted(mst_edge_indices_boruvka(len(nodes), *columns)) == sorted(mst_edge_indices_kruskal_np(len(nodes), *columns))
+        if cas % 1000 == 0:
+            assert sorted(mst_edge_indices_boruvka(len(nodes), *columns, workers=2)) == sorted(mst_edge_indices_kruskal_np(len(nodes), *columns))
+        # and take plain lists as well as NumPy arrays
+        lists = [column.tolist() for column in columns]
+        assert sorted(mst_edge_indices_boruvka(len(nodes), *lists)) == sorted(mst_edge_indices_kruskal_np(len(nodes), *lists)) == sorted(mst_edge_indices_kruskal_np(len(nodes), *columns))
+
+        # clustering on a (probably) disconnected subgraph
+        sub_edges = [edge for edge in edges if rand.random() < 0.5]
+        labels, dendrogram = single_linkage(nodes, sub_edges)
+        assert sum(height for a, b, height, size in dendrogram) == mst_cost_kruskal(nodes, sub_edges)
+        assert len(dendrogram) == len(nodes) - (max(labels, default=-1) + 1)
+        k = rand.randint(1, len(nodes))
+        labels_k, _ = single_linkage(nodes, sub_edges, k)
+        assert labels_k == labels_from_dendrogram(len(nodes), dendrogram, k)
+        assert max(labels_k) + 1 == max(k, max(labels) + 1)
+
+        # bulk finds on labelled nodes agree with find
+        names = [f'v{node}' for node in nodes]
+        comps = ConnectedComponents(names)
+        comps.union_many((f'v{edge.i}', f'v{edge.j}') for edge in sub_edges)
+        assert comps.find_many(names) == [comps.find(name) for name in names]
+        assert [names[root] for root in comps.find_many_idx(names)] == comps.find_many(names)
+
+        # dynamic mst: insert edges and lower edge costs one at a time
+        dyn = IncrementalMST(nodes, edges)
+        assert dyn.cost == cost_kruskal
+        for _ in range(rand.randint(0, 11)):
+            if not dyn.edges or rand.random() < 0.5:
+                i, j = rand.choices(nodes, k=2)
+                dyn.insert_edge(Edge(i, j, rand_cost()))
+            else:
+                idx = rand.randrange(len(dyn.edges))
+                dyn.decrease_weight(idx, rand.randint(0, dyn.edges[idx].cost))
+
+            assert dyn.cost == mst_cost_kruskal(nodes, dyn.edges)
+            assert dyn.cost == sum(edge.cost for edge in dyn.mst_edges())
 
 
 if __name__ == '__main__':
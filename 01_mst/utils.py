@@ -1,4 +1,7 @@
+from array import array
+from collections.abc import Sequence
 from dataclasses import dataclass
+from random import Random
 
 @dataclass
 class Edge:
@@ -14,6 +17,52 @@ def shuffled(rand, seq):
     return seq
 
 
+class CS33Random(Random):
+    def shuffled(self, seq):
+        return shuffled(self, seq)
+
+    def rand_cost(self):
+        # positive costs
+        return self.randint(1, self.choice([3, 11, 31, 111]))
+
+    def random_tree(self, n):
+        nodes = self.shuffled(range(n))
+        for i in range(1, n):
+            j = self.randrange(i)
+            i, j = self.shuffled((i, j))
+            yield Edge(nodes[i], nodes[j], self.rand_cost())
+
+    def random_graph(self, n, e):
+        def rand_edge():
+            i, j = self.choices(range(n), k=2)
+            return Edge(i, j, self.rand_cost())
+
+        return [rand_edge() for _ in range(e)]
+
+    def random_connected_graph(self, n, e):
+        assert e >= n - 1
+        edges = self.random_graph(n, e - (n - 1))
+
+        # add a random tree
+        edges += self.random_tree(n)
+
+        return self.shuffled(edges)
+
+    def grid_graph(self, rows, cols):
+        # rows x cols grid, node r*cols + c
+        edges = []
+        for r in range(rows):
+            for c in range(cols):
+                if c + 1 < cols:
+                    edges.append(Edge(r*cols + c, r*cols + c + 1, self.rand_cost()))
+                if r + 1 < rows:
+                    edges.append(Edge(r*cols + c, (r + 1)*cols + c, self.rand_cost()))
+        return self.shuffled(edges)
+
+    def complete_graph(self, n):
+        return self.shuffled(Edge(i, j, self.rand_cost()) for i in range(n) for j in range(i))
+
+
 def make_adjacency_list(nodes, edges):
     adj = {node: [] for node in nodes}
 
@@ -22,3 +71,222 @@ def make_adjacency_list(nodes, edges):
         adj[edge.j].append((edge.i, edge.cost))
 
     return adj
+
+
+class UnionFind:
+    # union-find over the dense indices 0..n-1.
+    # parent and size live in flat int32 arrays (4 bytes per node), and find is
+    # iterative with path halving, so long chains never hit the recursion limit.
+    def __init__(self, n):
+        self.parent = array('i', range(n))
+        self.size = array('i', [1])*n
+        self.comps = n
+        super().__init__()
+
+    def find(self, i):
+        parent = self.parent
+        while parent[i] != i:
+            # path halving: point i at its grandparent, then jump there
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, i, j):
+        # returns True if union is successful, false otherwise
+        i = self.find(i)
+        j = self.find(j)
+        if i == j:
+            return False
+
+        # union by size: make j the larger tree
+        if self.size[i] > self.size[j]:
+            i, j = j, i
+
+        self.parent[i] = j
+        self.size[j] += self.size[i]
+        self.comps -= 1
+
+        return True
+
+    def find_many(self, nodes):
+        return array('i', map(self.find, nodes))
+
+    def union_many(self, pairs):
+        # one success flag per pair, in order
+        union = self.union
+        return array('b', (union(i, j) for i, j in pairs))
+
+
+def _cost_array(costs):
+    # int64 if all costs are ints, float64 if some aren't, None if the graph is unweighted
+    costs = [*costs]
+    if costs and all(cost is None for cost in costs):
+        return None
+    try:
+        return array('q', costs)
+    except TypeError:
+        return array('d', costs)
+
+
+class CSRGraph:
+    # adjacency in compressed sparse row form. the arcs out of node i are the
+    # k in range(indptr[i], indptr[i + 1]): arc k goes to indices[k], costs
+    # weights[k], and comes from edges[edge_id[k]]. that's a few machine words
+    # per arc, instead of a tuple and an Edge reference.
+    #
+    # the same class as 02_shortest_path's CSRGraph, over node indices
+    # 0..n-1. graph[i] is a list of (j, cost, edge) arcs out of i, and
+    # neighbors(i) and costs(i) are zero-copy slices.
+    def __init__(self, indptr, indices, weights, edge_id, edges=None):
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.edge_id = edge_id
+        self.edges = edges
+        super().__init__()
+
+    @classmethod
+    def from_arrays(cls, n: int, i, j, cost=None, *, directed=False, edges=None):
+        # bulk build from parallel arrays i, j, cost (one entry per edge)
+        m = len(i)
+
+        # counting sort of the arcs by their tail. an undirected edge is an
+        # arc each way, added right after each other like make_adjacency_list
+        indptr = array('i', [0])*(n + 1)
+        for t in range(m):
+            indptr[i[t] + 1] += 1
+            if not directed:
+                indptr[j[t] + 1] += 1
+        for x in range(n):
+            indptr[x + 1] += indptr[x]
+
+        fill = indptr[:-1]
+        indices = array('i', [0])*indptr[n]
+        edge_id = array('i', [0])*indptr[n]
+
+        def add_arc(a, b, t):
+            k = fill[a]
+            fill[a] += 1
+            indices[k] = b
+            edge_id[k] = t
+
+        for t in range(m):
+            add_arc(i[t], j[t], t)
+            if not directed:
+                add_arc(j[t], i[t], t)
+
+        weights = None if cost is None else _cost_array(cost[t] for t in edge_id)
+
+        return cls(indptr, indices, weights, edge_id, edges)
+
+    @classmethod
+    def from_edges(cls, n: int, edges: Sequence[Edge], *, directed=False):
+        return cls.from_arrays(n,
+                array('i', (edge.i for edge in edges)),
+                array('i', (edge.j for edge in edges)),
+                [edge.cost for edge in edges],
+                directed=directed, edges=edges)
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    def __getitem__(self, i):
+        # compatibility view: the (j, cost, edge) list of make_adjacency_list
+        lo, hi = self.indptr[i], self.indptr[i + 1]
+        costs = self.costs(i) if self.weights is not None else [None]*(hi - lo)
+        edges = [self.edges[t] for t in self.edge_id[lo:hi]] if self.edges is not None else self.edge_id[lo:hi]
+        return [*zip(self.indices[lo:hi], costs, edges)]
+
+    def neighbors(self, i):
+        return memoryview(self.indices)[self.indptr[i]:self.indptr[i + 1]]
+
+    def costs(self, i):
+        return memoryview(self.weights)[self.indptr[i]:self.indptr[i + 1]]
+
+    def arc_ids(self, i):
+        return memoryview(self.edge_id)[self.indptr[i]:self.indptr[i + 1]]
+
+    def reverse(self):
+        # the same graph with every arc flipped
+        n = len(self)
+        tails = array('i', [0])*len(self.indices)
+        for i in range(n):
+            for k in range(self.indptr[i], self.indptr[i + 1]):
+                tails[k] = i
+
+        graph = CSRGraph.from_arrays(n, self.indices, tails, self.weights, directed=True)
+        # from_arrays numbered the arcs, point them back at the edges
+        graph.edge_id = array('i', (self.edge_id[k] for k in graph.edge_id))
+        graph.edges = self.edges
+        return graph
+
+
+class IndexedHeap:
+    # binary min-heap over the items 0..n-1 that supports decrease-key,
+    # so it never holds more than one entry per item
+    def __init__(self, n):
+        self.heap = []
+        self.pos = array('i', [-1])*n
+        self.key = [None]*n
+        super().__init__()
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, v):
+        return self.pos[v] >= 0
+
+    def push(self, v, key):
+        # insert v, or decrease its key if it's already in the heap.
+        # returns True if the key of v changed, false otherwise
+        if self.pos[v] < 0:
+            self.key[v] = key
+            self.pos[v] = len(self.heap)
+            self.heap.append(v)
+        elif key < self.key[v]:
+            self.key[v] = key
+        else:
+            return False
+
+        self._sift_up(self.pos[v])
+        return True
+
+    def pop(self):
+        heap = self.heap
+        v = heap[0]
+        last = heap.pop()
+        self.pos[v] = -1
+        if heap:
+            heap[0] = last
+            self.pos[last] = 0
+            self._sift_down(0)
+        return self.key[v], v
+
+    def _sift_up(self, loc):
+        heap, pos, key = self.heap, self.pos, self.key
+        v = heap[loc]
+        while loc > 0:
+            parent = (loc - 1) // 2
+            if key[heap[parent]] > key[v]:
+                heap[loc] = heap[parent]
+                pos[heap[loc]] = loc
+                loc = parent
+            else:
+                break
+        heap[loc] = v
+        pos[v] = loc
+
+    def _sift_down(self, loc):
+        heap, pos, key = self.heap, self.pos, self.key
+        v = heap[loc]
+        while (son := loc * 2 + 1) < len(heap):
+            if son + 1 < len(heap) and key[heap[son + 1]] < key[heap[son]]:
+                son += 1
+            if key[v] > key[heap[son]]:
+                heap[loc] = heap[son]
+                pos[heap[loc]] = loc
+                loc = son
+            else:
+                break
+        heap[loc] = v
+        pos[v] = loc
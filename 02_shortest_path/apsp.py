@@ -0,0 +1,155 @@
+import os
+
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from utils import CSRGraph, Edge
+
+from dijkstra import dijkstra
+
+
+# worker side: each pool process attaches to the shared CSR arrays once,
+# and wraps them in a read-only CSRGraph without copying them
+_shared = {}
+
+def _attach(arrays):
+    views = []
+    for name, typecode, size in arrays:
+        shm = SharedMemory(name=name)
+        _shared.setdefault('shms', []).append(shm)
+        views.append(shm.buf[:size*np.dtype(typecode).itemsize].cast(typecode))
+    _shared['graph'] = CSRGraph(*views, edge_id=None)
+
+
+def _row(task):
+    r, x = task
+    dists, _ = dijkstra(_shared['graph'], x)
+    return r, dists
+
+
+def _share(arrays):
+    # copy the arrays into shared memory blocks
+    shms = []
+    for arr in arrays:
+        shm = SharedMemory(create=True, size=max(1, len(arr)*arr.itemsize))
+        shm.buf[:len(arr)*arr.itemsize] = memoryview(arr).cast('B')
+        shms.append(shm)
+    return shms
+
+
+def _unreachable(dtype, unreachable):
+    # the sentinel for unreachable nodes: inf for floats, the largest value
+    # for integers, unless one is given
+    if unreachable is not None:
+        return unreachable
+    return np.iinfo(dtype).max if np.issubdtype(dtype, np.integer) else np.inf
+
+
+def _fill(dst, row, sentinel):
+    # copy a dijkstra dists array into dst. the sentinel is put in after the
+    # cast, since inf or a large integer sentinel don't survive it
+    row = np.frombuffer(row, dtype=np.float64)
+    unreachable = np.isinf(row)
+    dst[:] = np.where(unreachable, 0, row)
+    dst[unreachable] = sentinel
+
+
+def all_pairs_shortest_paths(n, edges, *, sources=None, workers=None, out=None, dtype=np.float64,
+        unreachable=None, chunksize=16):
+    # Dijkstra from every source (all nodes by default) on one prebuilt
+    # graph. each source runs in a process pool of `workers` processes
+    # (default: one per cpu, and 1 means no pool) that share the read-only
+    # CSR arrays. rows are written straight into a len(sources) x n matrix,
+    # which is memory-mapped to the file `out` if given, so only the graph
+    # and a few rows are ever in RAM.
+    #
+    # unreachable pairs are set to `unreachable`, see _unreachable.
+    graph = CSRGraph.from_edges(n, edges, directed=True)
+    if sources is None:
+        sources = range(n)
+    sentinel = _unreachable(dtype, unreachable)
+
+    shape = len(sources), n
+    if out is None:
+        dists = np.empty(shape, dtype=dtype)
+    else:
+        dists = np.lib.format.open_memmap(out, mode='w+', dtype=dtype, shape=shape)
+
+    def put(r, row):
+        _fill(dists[r], row, sentinel)
+
+    if workers is None:
+        workers = os.cpu_count()
+
+    if workers <= 1 or len(sources) <= 1:
+        for r, x in enumerate(sources):
+            put(r, dijkstra(graph, x)[0])
+    else:
+        arrays = graph.indptr, graph.indices, graph.weights
+        shms = _share(arrays)
+        try:
+            spec = [(shm.name, arr.typecode, len(arr)) for shm, arr in zip(shms, arrays)]
+            with Pool(workers, initializer=_attach, initargs=(spec,)) as pool:
+                for x, row in pool.imap_unordered(_row, enumerate(sources), chunksize=chunksize):
+                    put(x, row)
+        finally:
+            for shm in shms:
+                shm.close()
+                shm.unlink()
+
+    if out is not None:
+        dists.flush()
+    return dists
+
+
+def nearest_sources(n, edges, sources, *, dtype=np.float64, unreachable=None):
+    # one multi-source Dijkstra, all the sources starting at 0: for every
+    # node, the distance to the nearest source (say, the nearest facility)
+    # and which source that is, or -1 if none reaches it
+    graph = CSRGraph.from_edges(n, edges, directed=True)
+    row, pred = dijkstra(graph, sources)
+    dists = np.empty(n, dtype=dtype)
+    _fill(dists, row, _unreachable(dtype, unreachable))
+
+    # the source is the root of each node's branch of the pred forest
+    nearest = np.full(n, -1, dtype=np.intp)
+    for x in sources:
+        nearest[x] = x
+    for i in range(n):
+        walk = []
+        while nearest[i] < 0 and pred[i] >= 0:
+            walk.append(i)
+            i = pred[i]
+        nearest[walk] = nearest[i]
+
+    return dists, nearest
+
+
+def shortest_paths(n, edges):
+    return all_pairs_shortest_paths(n, edges, workers=1).tolist()
+
+
+if __name__ == '__main__':
+    print(all_pairs_shortest_paths(9, [
+        Edge(0, 1, 2),
+        Edge(1, 2, 1),
+        Edge(2, 3, 1),
+        Edge(3, 4, 1),
+        Edge(4, 5, 1),
+        Edge(5, 6, 1),
+        Edge(0, 7, 1),
+        Edge(7, 6, 7),
+    ], workers=2))
+
+    print(nearest_sources(9, [
+        Edge(0, 1, 2),
+        Edge(1, 2, 1),
+        Edge(2, 3, 1),
+        Edge(3, 4, 1),
+        Edge(4, 5, 1),
+        Edge(5, 6, 1),
+        Edge(0, 7, 1),
+        Edge(7, 6, 7),
+    ], [0, 4], dtype=np.int64, unreachable=-1))
@@ -0,0 +1,118 @@
+from array import array
+from collections import deque
+
+import numpy as np
+
+from utils import CSRGraph, Edge, INF
+
+
+# both functions return (True, dists, pred) like sp_demo.bellman_ford, but
+# when a negative cycle is reachable from s they return (False, cycle, None),
+# where cycle is the list of nodes around it, in order.
+
+
+def pred_cycle(pred):
+    # a cycle of the predecessor graph, or None. in a label-correcting
+    # algorithm, every such cycle is a negative cycle of the graph.
+    n = len(pred)
+    state = bytearray(n)  # 0: unseen, 1: on the current walk, 2: done
+    for v in range(n):
+        walk = []
+        while v >= 0 and not state[v]:
+            state[v] = 1
+            walk.append(v)
+            v = pred[v]
+        if v >= 0 and state[v] == 1:
+            cycle = walk[walk.index(v):]
+            return cycle[::-1]
+        for u in walk:
+            state[u] = 2
+    return None
+
+
+def spfa(graph: CSRGraph, s: int):
+    # Bellman-Ford, but only relaxing the arcs out of nodes whose distance
+    # changed, kept in a FIFO queue with in-queue flags. on graphs without
+    # negative cycles it stops as soon as nothing changes, which is usually
+    # long before |V| - 1 rounds.
+    #
+    # a reachable negative cycle shows up as a cycle in pred, so pred is
+    # checked every |V| relaxations, which costs O(1) amortized per relaxation.
+    n = len(graph)
+    dists = array('d', [INF])*n
+    pred = array('i', [-1])*n
+    in_queue = bytearray(n)
+
+    dists[s] = 0
+    queue = deque([s])
+    in_queue[s] = True
+
+    relaxations = 0
+    indptr, indices, weights = graph.indptr, graph.indices, graph.weights
+    while queue:
+        i = queue.popleft()
+        in_queue[i] = False
+        for k in range(indptr[i], indptr[i + 1]):
+            j = indices[k]
+            if dists[i] + weights[k] < dists[j]:
+                dists[j] = dists[i] + weights[k]
+                pred[j] = i
+                if not in_queue[j]:
+                    in_queue[j] = True
+                    queue.append(j)
+
+                relaxations += 1
+                if relaxations % n == 0 and (cycle := pred_cycle(pred)) is not None:
+                    return False, cycle, None
+
+    return True, dists, pred
+
+
+def bellman_ford_edges(n: int, i, j, cost, s: int):
+    # Bellman-Ford on parallel edge arrays, each round one vectorized pass
+    # over every edge: dists[j] = min(dists[j], dists[i] + cost). stops when
+    # a round changes nothing. for dense inputs, where most edges matter in
+    # most rounds anyway.
+    i = np.asarray(i, dtype=np.intp)
+    j = np.asarray(j, dtype=np.intp)
+    cost = np.asarray(cost, dtype=np.float64)
+
+    dists = np.full(n, INF)
+    pred = np.full(n, -1, dtype=np.intp)
+    dists[s] = 0
+
+    rounds = 0
+    while True:
+        cand = dists[i] + cost
+        new = dists.copy()
+        np.minimum.at(new, j, cand)
+        changed = new < dists
+        if not changed.any():
+            return True, dists, pred
+
+        # point each improved node at an edge that achieves its new distance
+        best = changed[j] & (cand == new[j])
+        pred[j[best]] = i[best]
+        dists = new
+
+        # past |V| - 1 rounds, only a negative cycle keeps things changing,
+        # and eventually it shows up in pred
+        rounds += 1
+        if rounds >= n and (cycle := pred_cycle(pred.tolist())) is not None:
+            return False, cycle, None
+
+
+if __name__ == '__main__':
+    edges = [
+        Edge(0, 1, 5),
+        Edge(0, 4, 2),
+        Edge(1, 2, 6),
+        Edge(2, 1, -3),
+        Edge(2, 3, 8),
+        Edge(4, 5, 3),
+        Edge(5, 4, -6),
+        Edge(5, 3, 7),
+    ]
+    print(spfa(CSRGraph.from_edges(6, edges, directed=True), 0))
+    print(spfa(CSRGraph.from_edges(6, edges[:4], directed=True), 0))
+    print(bellman_ford_edges(6, [e.i for e in edges], [e.j for e in edges], [e.cost for e in edges], 0))
@@ -0,0 +1,94 @@
+import argparse
+import csv
+import json
+import platform
+import time
+
+from utils import CS33Random, Edge
+
+from shortest_path1 import shortest_paths as sp_memo
+from shortest_path_neg import shortest_paths as sp_neg
+from floyd_np import shortest_paths as sp_floyd
+from johnson import shortest_paths as sp_johnson
+
+
+# name -> (shortest_paths, largest node count to try it on).
+# all of these handle negative costs
+sols = {
+    'memo': (sp_memo, 100),  # O(V^2 E) cache entries
+    'neg': (sp_neg, 300),  # O(V^2 E)
+    'floyd_np': (sp_floyd, 3000),  # O(V^3), V^2 memory
+    'johnson': (sp_johnson, 3000),  # O(V E log V)
+}
+
+
+def random_graph(rand, n, e, *, negative=True):
+    # random digraph without negative cycles: nonnegative costs, shifted by
+    # random potentials, which changes every cycle's cost by 0
+    p = [rand.randint(0, 50) if negative else 0 for _ in range(n)]
+    edges = []
+    for _ in range(e):
+        i, j = rand.randrange(n), rand.randrange(n)
+        edges.append(Edge(i, j, rand.randint(1, 100) + p[i] - p[j]))
+    return edges
+
+
+def bench(sizes, degree, impl_names, *, seed=33):
+    rand = CS33Random(seed)
+    for n in sizes:
+        edges = random_graph(rand, n, n*degree)
+
+        answers = []
+        for name in impl_names:
+            shortest_paths, max_nodes = sols[name]
+            if n > max_nodes:
+                continue
+
+            start = time.perf_counter()
+            answers.append(shortest_paths(n, edges))
+            seconds = time.perf_counter() - start
+
+            result = {
+                'n': n,
+                'e': len(edges),
+                'impl': name,
+                'seconds': seconds,
+            }
+            print(result)
+            yield result
+
+        # every implementation has to agree
+        assert all(answer == answers[0] for answer in answers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="time the all pairs shortest paths implementations that allow negative costs")
+    parser.add_argument('--sizes', nargs='+', type=int, default=[30, 100, 300, 1000])
+    parser.add_argument('--degree', type=int, default=4, help="average out degree")
+    parser.add_argument('--impls', nargs='+', choices=sols, default=[*sols])
+    parser.add_argument('--seed', type=int, default=33)
+    parser.add_argument('--json', help="write results to this JSON file")
+    parser.add_argument('--csv', help="write results to this CSV file")
+    args = parser.parse_args()
+
+    results = [*bench(args.sizes, args.degree, args.impls, seed=args.seed)]
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'seed': args.seed,
+                'degree': args.degree,
+                'results': results,
+            }, f, indent=2)
+
+    if args.csv:
+        with open(args.csv, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=[*results[0]] if results else [])
+            writer.writeheader()
+            writer.writerows(results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+from array import array
+from collections import deque
+from collections.abc import Iterable
+
+from utils import CSRGraph, Edge, INF
+
+from dijkstra import dijkstra
+
+
+# Dijkstra's algorithm specialized to small nonnegative integer costs, where
+# the heap can be replaced with something that doesn't compare keys. every
+# function here returns (dists, pred) like dijkstra.dijkstra.
+
+# largest cost dial is picked for. past that, its max_cost + 1 buckets take
+# more memory and skipping the empty ones more time than the radix heap
+DIAL_MAX_COST = 1 << 16
+
+
+def zero_one_bfs(graph: CSRGraph, sources: int | Iterable[int]):
+    # costs 0 and 1 only: a deque whose front half is at distance d and back
+    # half at d + 1. 0-cost arcs go in front, 1-cost arcs at the back
+    n = len(graph)
+    if isinstance(sources, int):
+        sources = sources,
+
+    dists = array('d', [INF])*n
+    pred = array('i', [-1])*n
+    done = bytearray(n)
+
+    queue = deque()
+    for s in sources:
+        dists[s] = 0
+        queue.append(s)
+
+    indptr, indices, weights = graph.indptr, graph.indices, graph.weights
+    while queue:
+        i = queue.popleft()
+        if done[i]:
+            continue
+        done[i] = True
+
+        d = dists[i]
+        for k in range(indptr[i], indptr[i + 1]):
+            j = indices[k]
+            if d + weights[k] < dists[j]:
+                dists[j] = d + weights[k]
+                pred[j] = i
+                if weights[k]:
+                    queue.append(j)
+                else:
+                    queue.appendleft(j)
+
+    return dists, pred
+
+
+def dial(graph: CSRGraph, sources: int | Iterable[int], max_cost: int):
+    # Dial's algorithm: costs up to max_cost, one bucket per distance. every
+    # node still waiting is within max_cost of the current distance, so
+    # max_cost + 1 buckets reused in a circle are enough. O(E + V + max dist)
+    n = len(graph)
+    if isinstance(sources, int):
+        sources = sources,
+
+    dists = array('d', [INF])*n
+    pred = array('i', [-1])*n
+    done = bytearray(n)
+
+    size = max_cost + 1
+    buckets = [[] for _ in range(size)]
+    waiting = 0
+    for s in sources:
+        dists[s] = 0
+        buckets[0].append(s)
+        waiting += 1
+
+    indptr, indices, weights = graph.indptr, graph.indices, graph.weights
+    d = 0
+    while waiting:
+        bucket = buckets[d % size]
+        while bucket:
+            i = bucket.pop()
+            waiting -= 1
+            # stale entries: i was settled at a smaller distance
+            if done[i]:
+                continue
+            done[i] = True
+
+            for k in range(indptr[i], indptr[i + 1]):
+                j = indices[k]
+                if d + weights[k] < dists[j]:
+                    dists[j] = d + weights[k]
+                    pred[j] = i
+                    buckets[(d + weights[k]) % size].append(j)
+                    waiting += 1
+        d += 1
+
+    return dists, pred
+
+
+class RadixHeap:
+    # monotone priority queue for nonnegative integer keys: every key pushed
+    # must be at least the last one popped. an entry sits in the bucket
+    # numbered by the highest bit where its key differs from the last popped
+    # key, so it only ever moves to lower buckets, at most 64 times.
+    def __init__(self):
+        self.buckets = [[] for _ in range(65)]
+        self.last = 0
+        self.size = 0
+        super().__init__()
+
+    def __len__(self):
+        return self.size
+
+    def push(self, key, v):
+        self.buckets[(key ^ self.last).bit_length()].append((key, v))
+        self.size += 1
+
+    def pop(self):
+        buckets = self.buckets
+        if not buckets[0]:
+            # the smallest key is in the first nonempty bucket. make it the
+            # new last key, after which that bucket's keys all belong lower
+            b = 1
+            while not buckets[b]:
+                b += 1
+            self.last = last = min(buckets[b])[0]
+            for key, v in buckets[b]:
+                buckets[(key ^ last).bit_length()].append((key, v))
+            buckets[b].clear()
+
+        self.size -= 1
+        return buckets[0].pop()
+
+
+def radix_dijkstra(graph: CSRGraph, sources: int | Iterable[int]):
+    # nonnegative integer costs of any size: O(E + V log C) with C the largest
+    n = len(graph)
+    if isinstance(sources, int):
+        sources = sources,
+
+    dists = array('d', [INF])*n
+    pred = array('i', [-1])*n
+    done = bytearray(n)
+
+    pq = RadixHeap()
+    for s in sources:
+        dists[s] = 0
+        pq.push(0, s)
+
+    indptr, indices, weights = graph.indptr, graph.indices, graph.weights
+    while pq:
+        d, i = pq.pop()
+        if done[i]:
+            continue
+        done[i] = True
+
+        for k in range(indptr[i], indptr[i + 1]):
+            j = indices[k]
+            if d + weights[k] < dists[j]:
+                dists[j] = d + weights[k]
+                pred[j] = i
+                pq.push(d + weights[k], j)
+
+    return dists, pred
+
+
+def integer_dijkstra(graph: CSRGraph, sources: int | Iterable[int]):
+    # picks the queue from a scan of the costs: 0-1 BFS, Dial's buckets or a
+    # radix heap for nonnegative integer costs, and the usual binary heap
+    # (dijkstra.dijkstra) for anything else
+    weights = graph.weights
+    if memoryview(weights).format != 'q' or not weights:
+        return dijkstra(graph, sources)
+
+    lo, hi = min(weights), max(weights)
+    if lo < 0:
+        return dijkstra(graph, sources)
+    elif hi <= 1:
+        return zero_one_bfs(graph, sources)
+    elif hi <= DIAL_MAX_COST:
+        return dial(graph, sources, hi)
+    else:
+        return radix_dijkstra(graph, sources)
+
+
+def shortest_paths(n, edges):
+    graph = CSRGraph.from_edges(n, edges, directed=True)
+    return [integer_dijkstra(graph, x)[0].tolist() for x in range(n)]
+
+
+if __name__ == '__main__':
+    edges = [
+        Edge(0, 1, 2),
+        Edge(1, 2, 1),
+        Edge(2, 3, 1),
+        Edge(3, 4, 1),
+        Edge(4, 5, 1),
+        Edge(5, 6, 1),
+        Edge(0, 7, 1),
+        Edge(7, 6, 7),
+    ]
+    graph = CSRGraph.from_edges(9, edges, directed=True)
+    print(dial(graph, 0, 7))
+    print(radix_dijkstra(graph, 0))
+    print(zero_one_bfs(CSRGraph.from_edges(9, [Edge(e.i, e.j, e.cost % 2) for e in edges], directed=True), 0))
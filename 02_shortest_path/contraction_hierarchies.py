@@ -0,0 +1,248 @@
+import struct
+
+from array import array
+from collections.abc import Sequence
+from heapq import heapify, heappush, heappop
+
+from utils import CSRGraph, Edge, INF
+
+
+_MAGIC = b'CH01'
+
+
+def _write_array(f, arr):
+    f.write(struct.pack('<cQ', arr.typecode.encode(), len(arr)))
+    arr.tofile(f)
+
+
+def _read_array(f):
+    typecode, size = struct.unpack('<cQ', f.read(struct.calcsize('<cQ')))
+    arr = array(typecode.decode())
+    arr.fromfile(f, size)
+    return arr
+
+
+class ContractionHierarchy:
+    # contraction hierarchies for repeated point-to-point queries on a static
+    # directed graph.
+    #
+    # preprocessing contracts the nodes one at a time, cheapest edge
+    # difference first. contracting v adds a shortcut u -> w (through v) for
+    # every u -> v -> w with no witness path u ~> w avoiding v that's as short.
+    # every arc then either goes up in rank (stored in `up`) or down (stored
+    # reversed in `down`), and mid[k] of an arc is the node it shortcuts, or -1.
+    #
+    # a query is Dijkstra upward from s on `up` and upward from t on `down`;
+    # the shortest path goes up to its highest-ranked node and back down, so
+    # both searches meet there. shortcuts are unpacked into the original path.
+    def __init__(self, rank, up: CSRGraph, up_mid, down: CSRGraph, down_mid):
+        self.rank = rank
+        self.up = up
+        self.up_mid = up_mid
+        self.down = down
+        self.down_mid = down_mid
+        super().__init__()
+
+    @classmethod
+    def build(cls, n: int, edges: Sequence[Edge], *, witness_limit: int = 100):
+        # witness_limit bounds the nodes each witness search settles. a lower
+        # one makes preprocessing faster but may add unneeded shortcuts.
+
+        # remaining graph, keeping only the cheapest of parallel edges
+        out = [{} for _ in range(n)]
+        inc = [{} for _ in range(n)]
+        mid = {}
+        for edge in edges:
+            if edge.i != edge.j and edge.cost < out[edge.i].get(edge.j, INF):
+                out[edge.i][edge.j] = inc[edge.j][edge.i] = edge.cost
+                mid[edge.i, edge.j] = -1
+
+        def witness_misses(u, v, targets):
+            # the w in targets with no path u ~> w avoiding v of cost <= targets[w]
+            limit = max(targets.values())
+            dist = {u: 0}
+            pq = [(0, u)]
+            settled = 0
+            while pq and settled < witness_limit:
+                d, x = heappop(pq)
+                if d > dist[x]:
+                    continue
+                if d > limit:
+                    break
+                settled += 1
+                for y, c in out[x].items():
+                    if y != v and d + c < dist.get(y, INF):
+                        dist[y] = d + c
+                        heappush(pq, (d + c, y))
+
+            return [w for w, c in targets.items() if dist.get(w, INF) > c]
+
+        def shortcuts(v):
+            res = []
+            for u, cu in inc[v].items():
+                targets = {w: cu + cw for w, cw in out[v].items() if w != u}
+                if targets:
+                    res += ((u, w, targets[w]) for w in witness_misses(u, v, targets))
+            return res
+
+        contracted_neighbors = [0]*n
+
+        def priority(v):
+            # edge difference, plus a term spreading contractions evenly over the graph
+            cuts = shortcuts(v)
+            return len(cuts) - len(inc[v]) - len(out[v]) + contracted_neighbors[v], cuts
+
+        # arcs of the hierarchy, as parallel arrays: tail, head, cost, mid
+        ups = [], [], [], []
+        downs = [], [], [], []
+
+        def add_arc(arcs, i, j, cost, m):
+            for col, val in zip(arcs, (i, j, cost, m)):
+                col.append(val)
+
+        rank = array('i', [0])*n
+        pq = [(priority(v)[0], v) for v in range(n)]
+        heapify(pq)
+        order = 0
+        while pq:
+            _, v = heappop(pq)
+
+            # lazy update: only contract v if it's still the cheapest
+            p, cuts = priority(v)
+            if pq and p > pq[0][0]:
+                heappush(pq, (p, v))
+                continue
+
+            for u, w, c in cuts:
+                if c < out[u].get(w, INF):
+                    out[u][w] = inc[w][u] = c
+                    mid[u, w] = v
+
+            # the arcs left at v all go to higher-ranked nodes
+            for w, c in out[v].items():
+                add_arc(ups, v, w, c, mid.pop((v, w)))
+                del inc[w][v]
+                contracted_neighbors[w] += 1
+            for u, c in inc[v].items():
+                add_arc(downs, v, u, c, mid.pop((u, v)))
+                del out[u][v]
+                contracted_neighbors[u] += 1
+            out[v].clear()
+            inc[v].clear()
+
+            rank[v] = order
+            order += 1
+
+        def make_graph(arcs):
+            i, j, cost, m = arcs
+            graph = CSRGraph.from_arrays(n, i, j, cost, directed=True)
+            return graph, array('i', (m[t] for t in graph.edge_id))
+
+        return cls(rank, *make_graph(ups), *make_graph(downs))
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(_MAGIC)
+            _write_array(f, self.rank)
+            for graph, mid in (self.up, self.up_mid), (self.down, self.down_mid):
+                weights = graph.weights if graph.weights is not None else array('q')
+                for arr in graph.indptr, graph.indices, weights, mid:
+                    _write_array(f, arr)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError(f"{path} is not a contraction hierarchy file")
+            rank = _read_array(f)
+            graphs = []
+            for _ in range(2):
+                indptr, indices, weights, mid = (_read_array(f) for _ in range(4))
+                graphs += CSRGraph(indptr, indices, weights, edge_id=None), mid
+        return cls(rank, *graphs)
+
+    def _mid(self, a, b):
+        # the node the arc a -> b shortcuts
+        if self.rank[a] < self.rank[b]:
+            graph, mid, x, y = self.up, self.up_mid, a, b
+        else:
+            graph, mid, x, y = self.down, self.down_mid, b, a
+        for k in range(graph.indptr[x], graph.indptr[x + 1]):
+            if graph.indices[k] == y:
+                return mid[k]
+        raise KeyError((a, b))
+
+    def query(self, s: int, t: int):
+        # returns (dist, path), path being [] if t is unreachable
+        graphs = self.up, self.down
+        dists = {s: 0}, {t: 0}
+        pred = {s: -1}, {t: -1}
+        pqs = [(0, s)], [(0, t)]
+
+        best = INF
+        meet = -1
+        while pqs[0] or pqs[1]:
+            for side in 0, 1:
+                pq, dist, g = pqs[side], dists[side], graphs[side]
+                if not pq:
+                    continue
+
+                d, x = heappop(pq)
+                if d > dist[x]:
+                    continue
+                if d >= best:
+                    # nothing this side still has can give a shorter path
+                    pq.clear()
+                    continue
+
+                if d + dists[1 - side].get(x, INF) < best:
+                    best = d + dists[1 - side][x]
+                    meet = x
+
+                for k in range(g.indptr[x], g.indptr[x + 1]):
+                    y = g.indices[k]
+                    if d + g.weights[k] < dist.get(y, INF):
+                        dist[y] = d + g.weights[k]
+                        pred[side][y] = x
+                        heappush(pq, (dist[y], y))
+
+        if best == INF:
+            return INF, []
+
+        # hierarchy path s -> meet -> t, then unpack each arc
+        hpath = [meet]
+        while pred[0][hpath[-1]] >= 0:
+            hpath.append(pred[0][hpath[-1]])
+        hpath.reverse()
+        while pred[1][hpath[-1]] >= 0:
+            hpath.append(pred[1][hpath[-1]])
+
+        path = [s]
+        for a, b in zip(hpath, hpath[1:]):
+            stack = [(a, b)]
+            while stack:
+                a, b = stack.pop()
+                m = self._mid(a, b)
+                if m < 0:
+                    path.append(b)
+                else:
+                    stack.append((m, b))
+                    stack.append((a, m))
+
+        return best, path
+
+
+if __name__ == '__main__':
+    ch = ContractionHierarchy.build(9, [
+        Edge(0, 1, 2),
+        Edge(1, 2, 1),
+        Edge(2, 3, 1),
+        Edge(3, 4, 1),
+        Edge(4, 5, 1),
+        Edge(5, 6, 1),
+        Edge(0, 7, 1),
+        Edge(7, 6, 7),
+    ])
+    print(ch.query(0, 6))
+    print(ch.query(7, 6))
+    print(ch.query(0, 8))
@@ -0,0 +1,146 @@
+from array import array
+from collections.abc import Iterable
+
+from utils import CSRGraph, Edge, INF
+
+
+class CycleError(ValueError):
+    # the graph isn't a DAG. cycle is a list of nodes around one of its cycles
+    def __init__(self, cycle):
+        self.cycle = cycle
+        super().__init__(f"graph has a cycle: {' -> '.join(map(str, cycle + cycle[:1]))}")
+
+
+def topological_order(graph: CSRGraph):
+    # Kahn's algorithm: repeatedly take a node with no incoming arcs left.
+    # raises CycleError if some nodes never get there
+    n = len(graph)
+    indptr, indices = graph.indptr, graph.indices
+
+    indeg = array('i', [0])*n
+    for j in indices:
+        indeg[j] += 1
+
+    order = array('i', (i for i in range(n) if not indeg[i]))
+    k = 0
+    while k < len(order):
+        i = order[k]
+        k += 1
+        for a in range(indptr[i], indptr[i + 1]):
+            j = indices[a]
+            indeg[j] -= 1
+            if not indeg[j]:
+                order.append(j)
+
+    if len(order) < n:
+        # every leftover node has an arc in from another leftover node, so
+        # walking those arcs backwards from any of them runs into a cycle
+        rgraph = graph.reverse()
+        seen = {}
+        v = next(i for i in range(n) if indeg[i])
+        while v not in seen:
+            seen[v] = len(seen)
+            v = next(u for u in rgraph.neighbors(v) if indeg[u])
+        walk = [*seen]
+        raise CycleError(walk[seen[v]:][::-1])
+
+    return order
+
+
+def dag_paths_from(graph: CSRGraph, sources: int | Iterable[int], *, longest=False, order=None):
+    # shortest (or, with longest=True, longest) paths from the nearest (or
+    # farthest) of the sources, relaxing each node's arcs once, in
+    # topological order: O(V + E), and negative costs are fine.
+    #
+    # returns (dists, pred) like dijkstra.dijkstra. unreachable nodes are at
+    # INF, or at -INF for longest paths. pass order (from topological_order)
+    # to skip sorting again, say when running from many sets of sources.
+    n = len(graph)
+    if order is None:
+        order = topological_order(graph)
+    if isinstance(sources, int):
+        sources = [sources]
+
+    # a longest path is a shortest path with every cost negated
+    sign = -1 if longest else 1
+    indptr, indices, weights = graph.indptr, graph.indices, graph.weights
+
+    dists = array('d', [INF])*n
+    pred = array('i', [-1])*n
+    for x in sources:
+        dists[x] = 0
+
+    for i in order:
+        d = dists[i]
+        if d == INF:
+            continue
+        for k in range(indptr[i], indptr[i + 1]):
+            j = indices[k]
+            if d + sign*weights[k] < dists[j]:
+                dists[j] = d + sign*weights[k]
+                pred[j] = i
+
+    if longest:
+        for i in range(n):
+            dists[i] = 0.0 - dists[i]
+    return dists, pred
+
+
+def dag_paths_to(graph: CSRGraph, dests: Iterable[int], *, longest=False, order=None):
+    # for each destination t, the list of shortest (or longest) path costs
+    # from every node to t, like sp_demo.sdsp but with one topological sort
+    # for all of them and O(V + E) per destination. only the nodes before t
+    # in topological order can reach it, so only those are looked at.
+    n = len(graph)
+    if order is None:
+        order = topological_order(graph)
+
+    pos = array('i', [0])*n
+    for k, i in enumerate(order):
+        pos[i] = k
+
+    sign = -1 if longest else 1
+    indptr, indices, weights = graph.indptr, graph.indices, graph.weights
+
+    res = []
+    for t in dests:
+        dists = array('d', [INF])*n
+        dists[t] = 0
+        for p in range(pos[t] - 1, -1, -1):
+            i = order[p]
+            d = dists[i]
+            for k in range(indptr[i], indptr[i + 1]):
+                if sign*weights[k] + dists[indices[k]] < d:
+                    d = sign*weights[k] + dists[indices[k]]
+            dists[i] = d
+
+        if longest:
+            for i in range(n):
+                dists[i] = 0.0 - dists[i]
+        res.append(dists)
+
+    return res
+
+
+if __name__ == '__main__':
+    # sp_demo.G1
+    edges = [
+        Edge(0, 1, 2),
+        Edge(0, 7, 1),
+        Edge(1, 2, 1),
+        Edge(2, 3, 1),
+        Edge(3, 4, 1),
+        Edge(4, 5, 1),
+        Edge(5, 6, 1),
+        Edge(7, 6, 7),
+    ]
+    graph = CSRGraph.from_edges(8, edges, directed=True)
+    print(list(topological_order(graph)))
+    print(dag_paths_from(graph, 0))
+    print(dag_paths_from(graph, 0, longest=True))
+    print([list(dists) for dists in dag_paths_to(graph, [6, 3])])
+
+    try:
+        topological_order(CSRGraph.from_edges(8, edges + [Edge(4, 2, 1)], directed=True))
+    except CycleError as e:
+        print(e)
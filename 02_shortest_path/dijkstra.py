@@ -0,0 +1,87 @@
+from array import array
+from collections.abc import Iterable
+
+from utils import CSRGraph, IndexedHeap, Edge, INF
+
+
+def dijkstra(graph: CSRGraph, sources: int | Iterable[int], *, targets: int | Iterable[int] | None = None):
+    # Dijkstra's algorithm on a prebuilt graph, from one or more sources.
+    # the heap has decrease-key, so it holds at most one entry per node.
+    #
+    # returns (dists, pred) as compact arrays: dists[i] is the distance to i
+    # (INF if unreachable), and pred[i] is the node before i on a shortest
+    # path (-1 for sources and unreachable nodes).
+    #
+    # with targets, the search stops as soon as all of them are settled. then
+    # dists and pred are only exact for the nodes settled so far, which
+    # includes every target.
+    n = len(graph)
+    if isinstance(sources, int):
+        sources = sources,
+    if isinstance(targets, int):
+        targets = targets,
+
+    dists = array('d', [INF])*n
+    pred = array('i', [-1])*n
+    done = bytearray(n)
+
+    if targets is not None:
+        is_target = bytearray(n)
+        for t in targets:
+            is_target[t] = True
+        remaining = sum(is_target)
+        if not remaining:
+            return dists, pred
+
+    pq = IndexedHeap(n)
+    for s in sources:
+        dists[s] = 0
+        pq.push(s, 0)
+
+    indptr, indices, weights = graph.indptr, graph.indices, graph.weights
+    while pq:
+        cost, i = pq.pop()
+        done[i] = True
+
+        if targets is not None and is_target[i]:
+            remaining -= 1
+            if not remaining:
+                break
+
+        for k in range(indptr[i], indptr[i + 1]):
+            j = indices[k]
+            if not done[j] and cost + weights[k] < dists[j]:
+                dists[j] = cost + weights[k]
+                pred[j] = i
+                pq.push(j, dists[j])
+
+    return dists, pred
+
+
+def path_to(pred, t):
+    # the shortest path ending at t, from the pred array of dijkstra
+    path = []
+    while t >= 0:
+        path.append(t)
+        t = pred[t]
+    return path[::-1]
+
+
+if __name__ == '__main__':
+    graph = CSRGraph.from_edges(9, [
+        Edge(0, 1, 2),
+        Edge(1, 2, 1),
+        Edge(2, 3, 1),
+        Edge(3, 4, 1),
+        Edge(4, 5, 1),
+        Edge(5, 6, 1),
+        Edge(0, 7, 1),
+        Edge(7, 6, 7),
+    ], directed=True)
+
+    dists, pred = dijkstra(graph, 0)
+    print(dists.tolist())
+    print(path_to(pred, 6))
+
+    dists, pred = dijkstra(graph, 0, targets=3)
+    print(dists[3], path_to(pred, 3))
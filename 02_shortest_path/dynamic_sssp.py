@@ -0,0 +1,172 @@
+from array import array
+from collections.abc import Iterable
+from dataclasses import replace
+from heapq import heapify, heappush, heappop
+
+from utils import Edge, INF
+
+from dijkstra import path_to
+
+
+class DynamicSSSP:
+    # shortest paths from s with nonnegative costs, kept up to date under
+    # edge insertions and weight changes instead of rerunning Dijkstra.
+    #
+    # dists and pred are as in dijkstra.dijkstra, and pred_edge[i] is the id
+    # of the edge into i on its shortest path, or -1. those edges form the
+    # shortest path tree, whose children lists are kept too.
+    #
+    # insertions and decreases relax outwards from the improved node, only
+    # ever touching nodes whose distance goes down. an increase on a tree
+    # edge u -> v is repaired like Ramalingam and Reps: of the subtree of v,
+    # the nodes that have another shortest path keep their distance, and
+    # Dijkstra reruns over just the others.
+    def __init__(self, n: int, edges: Iterable[Edge], s: int):
+        self.n = n
+        self.s = s
+
+        self.edges: list[Edge] = []
+        self.out = [[] for _ in range(n)]
+        self.inc = [[] for _ in range(n)]
+
+        self.dists = array('d', [INF])*n
+        self.pred = array('i', [-1])*n
+        self.pred_edge = array('i', [-1])*n
+        self.children = [set() for _ in range(n)]
+
+        for edge in edges:
+            self._add(edge)
+        self.dists[s] = 0
+        self._propagate([(0, s)])
+
+        super().__init__()
+
+    def _add(self, edge):
+        edge_idx = len(self.edges)
+        self.edges.append(edge)
+        self.out[edge.i].append(edge_idx)
+        self.inc[edge.j].append(edge_idx)
+        return edge_idx
+
+    def _set_pred(self, i, edge_idx):
+        if self.pred[i] >= 0:
+            self.children[self.pred[i]].discard(i)
+        self.pred_edge[i] = edge_idx
+        self.pred[i] = self.edges[edge_idx].i if edge_idx >= 0 else -1
+        if edge_idx >= 0:
+            self.children[self.pred[i]].add(i)
+
+    def _propagate(self, pq):
+        # Dijkstra from the (dist, node) entries in pq, whose distances just
+        # went down. only nodes whose distance goes down get pushed
+        dists, edges, out = self.dists, self.edges, self.out
+        heapify(pq)
+        while pq:
+            d, i = heappop(pq)
+            if d > dists[i]:
+                continue
+            for k in out[i]:
+                edge = edges[k]
+                if d + edge.cost < dists[edge.j]:
+                    dists[edge.j] = d + edge.cost
+                    self._set_pred(edge.j, k)
+                    heappush(pq, (dists[edge.j], edge.j))
+
+    def _relax(self, edge_idx):
+        edge = self.edges[edge_idx]
+        if self.dists[edge.i] + edge.cost < self.dists[edge.j]:
+            self.dists[edge.j] = self.dists[edge.i] + edge.cost
+            self._set_pred(edge.j, edge_idx)
+            self._propagate([(self.dists[edge.j], edge.j)])
+
+    def insert_edge(self, edge: Edge) -> int:
+        # returns the id of the edge, for set_weight
+        edge_idx = self._add(edge)
+        self._relax(edge_idx)
+        return edge_idx
+
+    def set_weight(self, edge_idx: int, cost: int):
+        # the Edge is replaced by a copy with the new cost, the caller's is untouched
+        if cost <= self.edges[edge_idx].cost:
+            self.decrease_weight(edge_idx, cost)
+        else:
+            self.increase_weight(edge_idx, cost)
+
+    def decrease_weight(self, edge_idx: int, cost: int):
+        edge = self.edges[edge_idx]
+        if cost > edge.cost:
+            raise ValueError(f"can't decrease the weight of {edge} to {cost}")
+
+        self.edges[edge_idx] = replace(edge, cost=cost)
+        self._relax(edge_idx)
+
+    def increase_weight(self, edge_idx: int, cost: int):
+        edge = self.edges[edge_idx]
+        if cost < edge.cost:
+            raise ValueError(f"can't increase the weight of {edge} to {cost}")
+
+        self.edges[edge_idx] = replace(edge, cost=cost)
+        if self.pred_edge[edge.j] != edge_idx:
+            # no shortest path used it
+            return
+
+        dists, edges, inc = self.dists, self.edges, self.inc
+
+        # the subtree of edge.j holds every node whose shortest path used the
+        # edge. going through it by distance (and parents before children on
+        # ties), a node keeps its distance if some edge into it is tight from
+        # a node that's outside the subtree or already kept its distance
+        subtree = [edge.j]
+        for i in subtree:
+            subtree += self.children[i]
+        subtree.sort(key=dists.__getitem__)
+
+        affected = set(subtree)
+        for i in subtree:
+            for k in inc[i]:
+                e = edges[k]
+                if e.i not in affected and dists[e.i] + e.cost == dists[i]:
+                    self._set_pred(i, k)
+                    affected.discard(i)
+                    break
+
+        # the rest get their best edge in from an unaffected node, and
+        # Dijkstra from there settles the paths among themselves
+        for i in affected:
+            dists[i] = INF
+            self._set_pred(i, -1)
+
+        pq = []
+        for i in affected:
+            for k in inc[i]:
+                e = edges[k]
+                if dists[e.i] + e.cost < dists[i]:
+                    dists[i] = dists[e.i] + e.cost
+                    self._set_pred(i, k)
+            if dists[i] < INF:
+                pq.append((dists[i], i))
+
+        self._propagate(pq)
+
+    def path_to(self, t: int):
+        return path_to(self.pred, t) if self.dists[t] < INF else []
+
+
+if __name__ == '__main__':
+    sssp = DynamicSSSP(9, [
+        Edge(0, 1, 2),
+        Edge(1, 2, 1),
+        Edge(2, 3, 1),
+        Edge(3, 4, 1),
+        Edge(4, 5, 1),
+        Edge(5, 6, 1),
+        Edge(0, 7, 1),
+        Edge(7, 6, 7),
+    ], 0)
+    print(sssp.dists.tolist(), sssp.path_to(6))
+    sssp.set_weight(7, 3)
+    print(sssp.dists.tolist(), sssp.path_to(6))
+    sssp.set_weight(0, 10)
+    print(sssp.dists.tolist(), sssp.path_to(6))
+    sssp.insert_edge(Edge(7, 8, 0))
+    print(sssp.dists.tolist(), sssp.path_to(8))
@@ -0,0 +1,99 @@
+import numpy as np
+
+from utils import Edge, INF
+
+from shortest_path_neg import NegativeCycle
+
+
+def adjacency_matrix(n, edges):
+    # cheapest direct edge between each pair, 0 (or a negative self-loop) on the diagonal
+    mat = np.full((n, n), INF)
+    np.fill_diagonal(mat, 0)
+    if edges:
+        i = np.array([edge.i for edge in edges])
+        j = np.array([edge.j for edge in edges])
+        cost = np.array([edge.cost for edge in edges], dtype=np.float64)
+        np.minimum.at(mat, (i, j), cost)
+    return mat
+
+
+def _relax(dists, pred, rows, cols, ks):
+    # dists[rows, cols] = min over k in ks of dists[rows, k] + dists[k, cols], in order of k
+    d = dists[rows, cols]
+    p = pred[rows, cols]
+    cand = np.empty_like(d)
+    better = np.empty(d.shape, dtype=bool)
+    for k in ks:
+        np.add(dists[rows, k, None], dists[None, k, cols], out=cand)
+        np.less(cand, d, out=better)
+        np.copyto(d, cand, where=better)
+        np.copyto(p, pred[None, k, cols], where=better)
+
+
+def floyd(dists, *, block=None):
+    # Floyd's algorithm, one broadcasted numpy step per intermediate node k.
+    # dists is an n x n float matrix (say from adjacency_matrix) and is
+    # updated in place. returns (dists, pred), where pred[i, j] is the node
+    # before j on a shortest path from i to j, or -1.
+    #
+    # with block=b, it runs the tiled version instead: for each b x b
+    # diagonal tile, first the tile itself, then its row and column of
+    # tiles, then every other tile. each phase only reads tiles that are
+    # already done for this block of k's, and touches one tile at a time,
+    # so it also works on memory-mapped matrices too large for RAM.
+    #
+    # there's a negative cycle through i iff dists[i, i] < 0 afterwards.
+    n = len(dists)
+    pred = np.where(np.isfinite(dists), np.arange(n)[:, None], -1)
+    np.fill_diagonal(pred, -1)
+
+    if block is None:
+        _relax(dists, pred, slice(None), slice(None), range(n))
+        return dists, pred
+
+    tiles = [slice(lo, min(lo + block, n)) for lo in range(0, n, block)]
+    for K in tiles:
+        ks = range(K.start, K.stop)
+        _relax(dists, pred, K, K, ks)
+        for T in tiles:
+            if T != K:
+                _relax(dists, pred, K, T, ks)
+                _relax(dists, pred, T, K, ks)
+        for I in tiles:
+            for J in tiles:
+                if I != K and J != K:
+                    _relax(dists, pred, I, J, ks)
+
+    return dists, pred
+
+
+def negative_cycle_nodes(dists):
+    return np.flatnonzero(np.diagonal(dists) < 0)
+
+
+def shortest_paths(n, edges, *, block=None):
+    dists, pred = floyd(adjacency_matrix(n, edges), block=block)
+    if len(negative_cycle_nodes(dists)):
+        raise NegativeCycle
+    return dists.tolist()
+
+
+if __name__ == '__main__':
+    for row in shortest_paths(9, [
+        Edge(0, 1, 2),
+        Edge(1, 2, 1),
+        Edge(2, 3, 1),
+        Edge(3, 4, 1),
+        Edge(4, 5, 1),
+        Edge(5, 6, 1),
+        Edge(0, 7, 1),
+        Edge(7, 6, 7),
+    ], block=4):
+        print(row)
+
+    dists, pred = floyd(adjacency_matrix(3, [
+        Edge(0, 1, 1),
+        Edge(1, 2, -3),
+        Edge(2, 1, 1),
+    ]))
+    print(negative_cycle_nodes(dists))
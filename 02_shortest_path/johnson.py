@@ -0,0 +1,46 @@
+import numpy as np
+
+from utils import CSRGraph, Edge
+
+from apsp import all_pairs_shortest_paths
+from bellman_ford import spfa
+from shortest_path_neg import NegativeCycle
+
+
+def johnson(n, edges, *, workers=1):
+    # Johnson's algorithm: all pairs shortest paths with negative costs, in
+    # O(V E log V) instead of O(V^3).
+    #
+    # one Bellman-Ford from a virtual node joined to every node by a 0 edge
+    # gives potentials h with h[j] <= h[i] + cost for every edge i -> j, so
+    # cost + h[i] - h[j] >= 0 and Dijkstra works on the reweighted graph.
+    # the reweighted path costs only shift by h[s] - h[t], so undo that after.
+    #
+    # raises NegativeCycle if there's a negative cycle anywhere.
+    # workers is as in apsp.all_pairs_shortest_paths. returns an n x n matrix.
+    virtual = [*edges, *(Edge(n, v, 0) for v in range(n))]
+    ok, h, _ = spfa(CSRGraph.from_edges(n + 1, virtual, directed=True), n)
+    if not ok:
+        raise NegativeCycle
+
+    reweighted = [Edge(edge.i, edge.j, edge.cost + h[edge.i] - h[edge.j]) for edge in edges]
+    dists = all_pairs_shortest_paths(n, reweighted, workers=workers)
+
+    h = np.frombuffer(h, dtype=np.float64)[:n]
+    dists += h[None, :] - h[:, None]
+    return dists
+
+
+def shortest_paths(n, edges):
+    return johnson(n, edges).tolist()
+
+
+if __name__ == '__main__':
+    for row in shortest_paths(5, [
+        Edge(0, 1, 1),
+        Edge(1, 2, -2),
+        Edge(2, 3, 1),
+        Edge(3, 4, 1),
+        Edge(3, 1, 1),
+    ]):
+        print(row)
@@ -0,0 +1,102 @@
+from collections.abc import Iterator
+from heapq import heappush, heappop
+from itertools import islice
+
+from utils import CSRGraph, Edge, INF
+
+from dijkstra import dijkstra, path_to
+
+
+def _spur_search(graph: CSRGraph, spur, t, blocked, blocked_next):
+    # Dijkstra from spur to t, avoiding the nodes in blocked and the arcs
+    # from spur to the nodes in blocked_next. returns (dists, pred) as dicts,
+    # so the cost is in the nodes it reaches, not all of them
+    dists = {spur: 0}
+    pred = {spur: -1}
+    done = set()
+    pq = [(0, spur)]
+
+    indptr, indices, weights = graph.indptr, graph.indices, graph.weights
+    while pq:
+        d, i = heappop(pq)
+        if i in done:
+            continue
+        done.add(i)
+        if i == t:
+            break
+
+        for k in range(indptr[i], indptr[i + 1]):
+            j = indices[k]
+            if j in blocked or (i == spur and j in blocked_next):
+                continue
+            if d + weights[k] < dists.get(j, INF):
+                dists[j] = d + weights[k]
+                pred[j] = i
+                heappush(pq, (dists[j], j))
+
+    return dists, pred
+
+
+def k_shortest_paths(graph: CSRGraph, s: int, t: int) -> Iterator[tuple[float, list[int]]]:
+    # Yen's algorithm: the simple paths from s to t as (cost, path) in order
+    # of cost, with nonnegative costs. it's a generator, and each path is
+    # only worked out when it's asked for, so the first is just one Dijkstra.
+    #
+    # every other path leaves an earlier one at some spur node, having
+    # followed its root (the prefix up to the spur), then takes the shortest
+    # way to t that doesn't reuse a root node or follow an arc that earlier
+    # paths with the same root took next. spur searches only start at or
+    # after the node where a path left its own parent (Lawler), since the
+    # earlier ones were already tried from the parent.
+    dists, pred = dijkstra(graph, s, targets=t)
+    if dists[t] == INF:
+        return
+
+    # a path is (cost, path, prefix costs, index it deviates at)
+    first = path_to(pred, t)
+    candidates = [(dists[t], first, [dists[i] for i in first], 0)]
+    seen = {tuple(first)}
+
+    # root prefix -> the nodes the paths found so far took next
+    taken_next = {}
+
+    while candidates:
+        cost, path, prefix, dev = heappop(candidates)
+        yield cost, path
+
+        for i in range(len(path) - 1):
+            taken_next.setdefault(tuple(path[:i + 1]), set()).add(path[i + 1])
+
+        for i in range(dev, len(path) - 1):
+            spur = path[i]
+            root = path[:i + 1]
+            spur_dists, spur_pred = _spur_search(graph, spur, t, set(root[:-1]), taken_next[tuple(root)])
+            if t not in spur_dists:
+                continue
+
+            new = root[:-1] + path_to(spur_pred, t)
+            if tuple(new) not in seen:
+                seen.add(tuple(new))
+                new_prefix = prefix[:i] + [prefix[i] + spur_dists[j] for j in new[i:]]
+                heappush(candidates, (new_prefix[-1], new, new_prefix, i))
+
+
+def yen(graph: CSRGraph, s: int, t: int, k: int):
+    # the (up to) k shortest simple paths from s to t, as (cost, path)
+    return [*islice(k_shortest_paths(graph, s, t), k)]
+
+
+if __name__ == '__main__':
+    graph = CSRGraph.from_edges(6, [
+        Edge(0, 1, 3),
+        Edge(0, 2, 2),
+        Edge(1, 3, 4),
+        Edge(2, 1, 1),
+        Edge(2, 3, 2),
+        Edge(2, 4, 3),
+        Edge(3, 4, 2),
+        Edge(3, 5, 1),
+        Edge(4, 5, 2),
+    ], directed=True)
+    for cost, path in yen(graph, 0, 5, 5):
+        print(cost, path)
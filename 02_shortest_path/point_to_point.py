@@ -0,0 +1,126 @@
+import math
+
+from collections.abc import Callable
+
+from utils import CSRGraph, IndexedHeap, Edge, INF
+
+from dijkstra import path_to
+
+
+# point-to-point queries: each returns (dist, path, settled), where path is
+# the list of nodes from s to t ([] if t is unreachable), and settled is how
+# many nodes the search settled, to compare search spaces between methods.
+
+
+def astar(graph: CSRGraph, s: int, t: int, heuristic: Callable[[int], float] | None = None):
+    # A* search. heuristic(i) must never overestimate the distance from i to t.
+    # without one, this is Dijkstra's algorithm stopping at t.
+    #
+    # a node popped with a stale distance is opened again, so the answer is
+    # right for any admissible heuristic, not just consistent ones.
+    n = len(graph)
+    h = heuristic or (lambda i: 0)
+
+    dists = [INF]*n
+    pred = [-1]*n
+    dists[s] = 0
+
+    pq = IndexedHeap(n)
+    pq.push(s, h(s))
+
+    settled = 0
+    indptr, indices, weights = graph.indptr, graph.indices, graph.weights
+    while pq:
+        _, i = pq.pop()
+        settled += 1
+
+        if i == t:
+            return dists[t], path_to(pred, t), settled
+
+        for k in range(indptr[i], indptr[i + 1]):
+            j = indices[k]
+            if dists[i] + weights[k] < dists[j]:
+                dists[j] = dists[i] + weights[k]
+                pred[j] = i
+                pq.push(j, dists[j] + h(j))
+
+    return INF, [], settled
+
+
+def bidirectional_dijkstra(graph: CSRGraph, rgraph: CSRGraph, s: int, t: int):
+    # Dijkstra's algorithm from s on graph and from t on rgraph (its reverse,
+    # see CSRGraph.reverse) at the same time, always settling the closer of
+    # the two next nodes. once the two smallest keys add up to at least the
+    # best s-t path seen, that path is a shortest one.
+    n = len(graph)
+
+    dists = [INF]*n, [INF]*n
+    pred = [-1]*n, [-1]*n
+    done = bytearray(n), bytearray(n)
+    pqs = IndexedHeap(n), IndexedHeap(n)
+    graphs = graph, rgraph
+
+    for side, x in enumerate((s, t)):
+        dists[side][x] = 0
+        pqs[side].push(x, 0)
+
+    best = INF if s != t else 0
+    meet = s
+    settled = 0
+    while pqs[0] and pqs[1]:
+        tops = [pq.key[pq.heap[0]] for pq in pqs]
+        if tops[0] + tops[1] >= best:
+            break
+
+        side = 0 if tops[0] <= tops[1] else 1
+        dist, other, g = dists[side], dists[1 - side], graphs[side]
+
+        cost, i = pqs[side].pop()
+        done[side][i] = True
+        settled += 1
+
+        for k in range(g.indptr[i], g.indptr[i + 1]):
+            j = g.indices[k]
+            c = cost + g.weights[k]
+            if not done[side][j] and c < dist[j]:
+                dist[j] = c
+                pred[side][j] = i
+                pqs[side].push(j, c)
+            if c + other[j] < best:
+                best = c + other[j]
+                meet = j
+
+    if best == INF:
+        return INF, [], settled
+
+    # forward half up to the meeting node, then follow the backward search's pred to t
+    path = path_to(pred[0], meet)
+    while path[-1] != t:
+        path.append(pred[1][path[-1]])
+
+    return best, path, settled
+
+
+def euclidean(coords, t):
+    # straight-line distance to t, admissible when edge costs are at least
+    # the distance between their endpoints
+    tx, ty = coords[t]
+    return lambda i: math.hypot(coords[i][0] - tx, coords[i][1] - ty)
+
+
+if __name__ == '__main__':
+    edges = [
+        Edge(0, 1, 2),
+        Edge(1, 2, 1),
+        Edge(2, 3, 1),
+        Edge(3, 4, 1),
+        Edge(4, 5, 1),
+        Edge(5, 6, 1),
+        Edge(0, 7, 1),
+        Edge(7, 6, 7),
+    ]
+    graph = CSRGraph.from_edges(9, edges, directed=True)
+
+    print(astar(graph, 0, 6))
+    print(bidirectional_dijkstra(graph, graph.reverse(), 0, 6))
+    print(bidirectional_dijkstra(graph, graph.reverse(), 0, 8))
@@ -0,0 +1,204 @@
+import argparse
+import json
+import time
+
+from contextlib import contextmanager
+from functools import cache as _cache, wraps
+from heapq import heappush as _heappush, heappop as _heappop
+
+from utils import CS33Random, Edge
+
+
+# opt-in instrumentation for the shortest path variants. nothing in them
+# changes: profile_call swaps counting versions of the helpers a module uses
+# (heappush, heappop, cache, min, make_adjacency_*) into its globals for the
+# length of one call, and puts the originals back after. so when it isn't
+# used, there's no overhead at all. not thread-safe, since it patches globals.
+
+
+class _CountingRows(list):
+    # adjacency list that counts the arcs in every row read as relaxations
+    def __init__(self, rows, prof):
+        super().__init__(rows)
+        self.prof = prof
+
+    def __getitem__(self, i):
+        row = super().__getitem__(i)
+        self.prof.relaxations += len(row)
+        return row
+
+
+class _CountingMapping(dict):
+    # same, for adjacency dicts like sp_demo's
+    def __init__(self, rows, prof):
+        super().__init__(rows)
+        self.prof = prof
+
+    def __getitem__(self, i):
+        row = super().__getitem__(i)
+        self.prof.relaxations += len(row)
+        return row
+
+
+class Profile:
+    # counters for one call:
+    #   pushes, pops: heap operations
+    #   stale_pops: pops of a node already popped from the same heap
+    #   relaxations: arcs scanned, or for the matrix variants, min() calls
+    #   subproblems: cache misses of the memoized variants
+    #   max_heap: largest size any heap reached
+    # and phases, wall time in seconds: build (making the adjacency list or
+    # matrix), search (the rest) and total
+    def __init__(self, name=''):
+        self.name = name
+        self.pushes = 0
+        self.pops = 0
+        self.stale_pops = 0
+        self.relaxations = 0
+        self.subproblems = 0
+        self.max_heap = 0
+        self.phases = {}
+        self._popped = {}
+        super().__init__()
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0) + time.perf_counter() - start
+
+    def heappush(self, heap, item):
+        _heappush(heap, item)
+        self.pushes += 1
+        self.max_heap = max(self.max_heap, len(heap))
+
+    def heappop(self, heap):
+        item = _heappop(heap)
+        self.pops += 1
+
+        # items are (cost, node). the heap is kept too, so its id isn't reused
+        _, popped = self._popped.setdefault(id(heap), (heap, set()))
+        if item[-1] in popped:
+            self.stale_pops += 1
+        else:
+            popped.add(item[-1])
+        return item
+
+    def cache(self, f):
+        @wraps(f)
+        def miss(*args):
+            self.subproblems += 1
+            return f(*args)
+        return _cache(miss)
+
+    def min(self, *args, **kwargs):
+        self.relaxations += 1
+        return min(*args, **kwargs)
+
+    def _build(self, make, rows):
+        @wraps(make)
+        def timed(*args, **kwargs):
+            with self.phase('build'):
+                res = make(*args, **kwargs)
+            return _CountingRows(res, self) if rows else res
+        return timed
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'pushes': self.pushes,
+            'pops': self.pops,
+            'stale_pops': self.stale_pops,
+            'relaxations': self.relaxations,
+            'subproblems': self.subproblems,
+            'max_heap': self.max_heap,
+            'phases': self.phases,
+        }
+
+    def to_json(self, path=None):
+        # the summary as a JSON string, also written to path if given
+        text = json.dumps(self.to_dict(), indent=2)
+        if path is not None:
+            with open(path, 'w') as f:
+                f.write(text)
+        return text
+
+
+def profile_call(func, *args, name=None, **kwargs):
+    # calls func(*args, **kwargs) with its module instrumented, and returns
+    # (result, Profile). dict arguments (sp_demo's adjacency) are wrapped so
+    # the arcs scanned are counted too.
+    prof = Profile(name or f'{func.__module__}.{func.__qualname__}')
+    ns = func.__globals__
+
+    patches = {}
+    for helper in 'heappush', 'heappop', 'cache':
+        if helper in ns:
+            patches[helper] = getattr(prof, helper)
+    if 'make_adjacency_list' in ns:
+        patches['make_adjacency_list'] = prof._build(ns['make_adjacency_list'], rows=True)
+    if 'make_adjacency_matrix' in ns:
+        patches['make_adjacency_matrix'] = prof._build(ns['make_adjacency_matrix'], rows=False)
+        patches['min'] = prof.min
+
+    args = [_CountingMapping(arg, prof) if isinstance(arg, dict) else arg for arg in args]
+
+    saved = {helper: ns[helper] for helper in patches if helper in ns}
+    ns.update(patches)
+    try:
+        with prof.phase('total'):
+            result = func(*args, **kwargs)
+    finally:
+        for helper in patches:
+            if helper in saved:
+                ns[helper] = saved[helper]
+            else:
+                del ns[helper]
+        prof._popped.clear()
+
+    prof.phases['search'] = prof.phases['total'] - prof.phases.get('build', 0)
+    return result, prof
+
+
+def main():
+    parser = argparse.ArgumentParser(description="count the work each shortest path variant does on a random graph")
+    parser.add_argument('-n', type=int, default=30, help="nodes")
+    parser.add_argument('-e', type=int, default=120, help="edges")
+    parser.add_argument('--seed', type=int, default=33)
+    parser.add_argument('--json', help="write the summaries to this JSON file")
+    args = parser.parse_args()
+
+    import shortest_path1, shortest_path2, shortest_path3, shortest_path4, shortest_path5
+    import sp_demo  # prints its demo on import
+
+    rand = CS33Random(args.seed)
+    n = args.n
+    edges = [Edge(rand.randrange(n), rand.randrange(n), rand.randint(1, 100)) for _ in range(args.e)]
+    adj = {i: [] for i in range(n)}
+    for edge in edges:
+        adj[edge.i].append((edge.cost, edge.j))
+
+    profiles = []
+    for module in shortest_path1, shortest_path2, shortest_path3, shortest_path4, shortest_path5:
+        _, prof = profile_call(module.shortest_paths, n, edges)
+        profiles.append(prof)
+    _, prof = profile_call(sp_demo.dijkstra, adj, 0)
+    profiles.append(prof)
+
+    for prof in profiles:
+        print(prof.to_dict())
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'n': n,
+                'e': len(edges),
+                'seed': args.seed,
+                'profiles': [prof.to_dict() for prof in profiles],
+            }, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+from utils import CSRGraph, Edge
+
+from dijkstra import dijkstra
+
+
+def shortest_paths_from(n, edges, x):
+    # Dijkstra's algorithm with decrease-key, on a CSR graph
+    dists, pred = dijkstra(CSRGraph.from_edges(n, edges, directed=True), x)
+    return dists.tolist()
+
+
+def shortest_paths(n, edges):
+    # build the graph once for all the sources
+    graph = CSRGraph.from_edges(n, edges, directed=True)
+    return [dijkstra(graph, x)[0].tolist() for x in range(n)]
+
+
+if __name__ == '__main__':
+    for row in shortest_paths(5, [
+        Edge(0, 1, 1),
+        Edge(1, 2, 1),
+        Edge(2, 3, 1),
+        Edge(3, 4, 1),
+        Edge(3, 1, 1),
+    ]):
+        print(row)
+
+    print()
+
+
+    for row in shortest_paths(9, [
+        Edge(0, 1, 2),
+        Edge(1, 2, 1),
+        Edge(2, 3, 1),
+        Edge(3, 4, 1),
+        Edge(4, 5, 1),
+        Edge(5, 6, 1),
+        Edge(0, 7, 1),
+        Edge(7, 6, 7),
+    ]):
+        print(row)
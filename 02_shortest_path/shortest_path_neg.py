@@ -1,5 +1,3 @@
-from functools import cache
-
 from utils import make_adjacency_list, Edge
 
 INF = float('inf')
@@ -8,28 +6,37 @@ class NegativeCycle(ValueError):
     pass
 
 def shortest_paths_to(n, edges, x):
-
     adj = make_adjacency_list(n, edges, directed=True)
+    return _shortest_paths_to(n, adj, x)
+
+
+def _shortest_paths_to(n, adj, x):
+    # d[i] = shortest path from i to x with at most t edges, for t = 0, 1, ..., n + 1.
+    # only the last two rounds are kept
+    d = [INF]*n
+    d[x] = 0
 
-    @cache
-    def d(i, t):
-        # shortest path from i to x with at most t edges
-        assert t >= 0
-        if i == x:
-            return 0
-        elif t == 0:
-            return INF
-        else:
-            return min((c + d(j, t - 1) for j, c, _ in adj[i]), default=INF)
+    for t in range(n + 1):
+        e = [0 if i == x else min((c + d[j] for j, c, _ in adj[i]), default=INF) for i in range(n)]
 
-    if any(d(i, n + 1) < d(i, n) for i in range(n)):
-        raise NegativeCycle
+        if t == n:
+            # e is round n + 1 and d is round n, anything still improving is on a negative cycle
+            if any(e[i] < d[i] for i in range(n)):
+                raise NegativeCycle
+            break
 
-    return [d(i, n) for i in range(n)]
+        if e == d:
+            # nothing changes from here on
+            break
+
+        d = e
+
+    return d
 
 
 def shortest_paths(n, edges):
-    dists = [shortest_paths_to(n, edges, x) for x in range(n)]
+    adj = make_adjacency_list(n, edges, directed=True)
+    dists = [_shortest_paths_to(n, adj, x) for x in range(n)]
 
     return [[dists[j][i] for j in range(n)] for i in range(n)]
 
@@ -0,0 +1,177 @@
+import hashlib
+import struct
+
+from collections import OrderedDict
+from itertools import count
+
+import numpy as np
+
+from utils import CSRGraph, Edge
+
+from dijkstra import dijkstra
+
+
+_tokens = count()
+
+
+class EdgeList(list):
+    # a list of edges with a version number that goes up on every change
+    # made through the list, so ShortestPathCache can tell it changed in
+    # O(1) instead of hashing it. replace an edge to change its cost,
+    # editing an Edge in place isn't seen.
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.token = next(_tokens)
+        self.version = 0
+
+    def _changed(method):
+        def changed(self, *args):
+            self.version += 1
+            return method(self, *args)
+        changed.__name__ = method.__name__
+        return changed
+
+    __setitem__ = _changed(list.__setitem__)
+    __delitem__ = _changed(list.__delitem__)
+    __iadd__ = _changed(list.__iadd__)
+    __imul__ = _changed(list.__imul__)
+    append = _changed(list.append)
+    extend = _changed(list.extend)
+    insert = _changed(list.insert)
+    pop = _changed(list.pop)
+    remove = _changed(list.remove)
+    clear = _changed(list.clear)
+    reverse = _changed(list.reverse)
+
+    def sort(self, *, key=None, reverse=False):
+        self.version += 1
+        super().sort(key=key, reverse=reverse)
+
+    del _changed
+
+
+def graph_fingerprint(n, edges):
+    # (token, version, n) for an EdgeList, else a hash of the whole graph: its
+    # columns go into NumPy arrays and blake2b hashes their buffers, a few
+    # times faster than hashing a repr of every edge. still O(E) per call,
+    # so use an EdgeList for graphs that are queried a lot.
+    if isinstance(edges, EdgeList):
+        return edges.token, edges.version, n
+
+    m = len(edges)
+    h = hashlib.blake2b(struct.pack('<qq', n, m), digest_size=16)
+    h.update(np.fromiter((edge.i for edge in edges), np.int64, m).tobytes())
+    h.update(np.fromiter((edge.j for edge in edges), np.int64, m).tobytes())
+
+    # int64 or float64 by what the costs are, and the dtype goes in the hash
+    # too. costs NumPy can't hold (ints past 64 bits, say) fall back to repr
+    cost = np.array([edge.cost for edge in edges])
+    h.update(cost.dtype.str.encode())
+    h.update(cost.tobytes() if cost.dtype != object else repr(cost.tolist()).encode())
+    return h.digest()
+
+
+class ShortestPathCache:
+    # shortest path trees by (graph_fingerprint, source), as the compact
+    # (dists, pred) arrays of dijkstra.dijkstra, least recently used first
+    # out once they take more than max_bytes. the graph for the latest
+    # fingerprint is kept too, so a miss doesn't rebuild it.
+    #
+    # when an EdgeList's version changes, the trees of its old version are
+    # dropped right away. other edge lists are fingerprinted by their
+    # content, so their stale trees are never hit, and just age out.
+    #
+    # solver(graph, x) must return (dists, pred), say bucket_queue.integer_dijkstra.
+    # the arrays returned are the cached ones, don't modify them.
+    def __init__(self, max_bytes=1 << 26, solver=dijkstra):
+        self.max_bytes = max_bytes
+        self.solver = solver
+
+        self.trees = OrderedDict()
+        self.nbytes = 0
+        self.versions = {}  # EdgeList token -> version with cached trees
+        self.graph = None, None
+
+        self.hits = 0
+        self.misses = 0
+        super().__init__()
+
+    def __len__(self):
+        return len(self.trees)
+
+    def _drop(self, key):
+        dists, pred = self.trees.pop(key)
+        self.nbytes -= _size(dists, pred)
+
+    def _invalidate(self, fingerprint):
+        if not isinstance(fingerprint, tuple):
+            return
+        token, version, _ = fingerprint
+        old = self.versions.get(token)
+        if old is not None and old != version:
+            # every node count queried at the old version
+            for key in [key for key in self.trees if key[0][:2] == (token, old)]:
+                self._drop(key)
+        self.versions[token] = version
+
+    def get(self, n, edges, x):
+        fingerprint = graph_fingerprint(n, edges)
+        self._invalidate(fingerprint)
+
+        key = fingerprint, x
+        tree = self.trees.get(key)
+        if tree is not None:
+            self.hits += 1
+            self.trees.move_to_end(key)
+            return tree
+
+        self.misses += 1
+        if self.graph[0] != fingerprint:
+            self.graph = fingerprint, CSRGraph.from_edges(n, edges, directed=True)
+        tree = self.solver(self.graph[1], x)
+
+        size = _size(*tree)
+        if size <= self.max_bytes:
+            self.trees[key] = tree
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                self._drop(next(iter(self.trees)))
+
+        return tree
+
+    def dists_from(self, n, edges, x):
+        # the cached dists array itself, no copy
+        return self.get(n, edges, x)[0]
+
+    def shortest_paths_from(self, n, edges, x):
+        # drop-in for shortest_path6.shortest_paths_from, a fresh list
+        return self.dists_from(n, edges, x).tolist()
+
+    def clear(self):
+        self.trees.clear()
+        self.nbytes = 0
+        self.versions.clear()
+        self.graph = None, None
+
+
+def _size(dists, pred):
+    return len(dists)*dists.itemsize + len(pred)*pred.itemsize
+
+
+if __name__ == '__main__':
+    edges = EdgeList([
+        Edge(0, 1, 2),
+        Edge(1, 2, 1),
+        Edge(2, 3, 1),
+        Edge(3, 4, 1),
+        Edge(4, 5, 1),
+        Edge(5, 6, 1),
+        Edge(0, 7, 1),
+        Edge(7, 6, 7),
+    ])
+    cache = ShortestPathCache(max_bytes=200)
+    print(cache.shortest_paths_from(9, edges, 0))
+    print(cache.dists_from(9, edges, 0))
+    edges[6] = Edge(0, 7, 10)
+    print(cache.shortest_paths_from(9, edges, 0))
+    print(cache.hits, cache.misses, len(cache), cache.nbytes)
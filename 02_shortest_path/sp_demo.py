@@ -3,6 +3,10 @@ import math
 from functools import cache
 from heapq import heappush, heappop
 
+from utils import CSRGraph, Edge
+
+from dag import dag_paths_to
+
 
 G_w = {  # weighted graph with cycles
     0: [(3, 1), (7, 3), (8, 4)],
@@ -72,6 +76,13 @@ def sdsp(adj, dest):  # single destination shortest path
     return [dist(s, n - 1) for s in range(n)]
 
 
+def sdsp_dag(adj, dest):  # single destination shortest path
+    # only works on DAGs, like sdsp_looping, but in O(V + E) with no recursion
+    n = len(adj)
+    graph = CSRGraph.from_edges(n, [Edge(i, j, c) for i in adj for c, j in adj[i]], directed=True)
+    return list(dag_paths_to(graph, [dest])[0])
+
+
 def adjm_from_adjlist(adjlist):
     n = len(adjlist)
     A = [[0 if i == j else math.inf for j in range(n)] for i in range(n)]
@@ -151,6 +162,9 @@ def bellman_ford(adj, S):
 costs = sdsp_looping(G1, 6)  # shortest path costs going to node 6
 print(costs)
 
+costs = sdsp_dag(G1, 6)  # same, topological order instead of memoization
+print(costs)
+
 # costs = sdsp_looping(G_w, 4)  # should produce RecursionError
 # print(costs)
 
@@ -1,13 +1,39 @@
-from utils import Edge, CS33Random
+import os
+import tempfile
+
+from heapq import heappush
+from itertools import islice
+
+import numpy as np
+
+from utils import Edge, CS33Random, INF, CSRGraph, make_adjacency_list
 
 from shortest_path1 import shortest_paths as sp1
 from shortest_path2 import shortest_paths as sp2
 from shortest_path3 import shortest_paths as sp3
 from shortest_path4 import shortest_paths as sp4
 from shortest_path5 import shortest_paths as sp5
-from shortest_path_neg import shortest_paths as sp_neg
+from shortest_path6 import shortest_paths as sp6
+from shortest_path_neg import shortest_paths as sp_neg, NegativeCycle
+from floyd_np import shortest_paths as sp_floyd
+from apsp import shortest_paths as sp_apsp, all_pairs_shortest_paths, nearest_sources
+from johnson import shortest_paths as sp_johnson, johnson
+from dynamic_sssp import DynamicSSSP
+from k_shortest_paths import k_shortest_paths
+from profiling import profile_call
+from sp_cache import ShortestPathCache, EdgeList, graph_fingerprint
+from bucket_queue import shortest_paths as sp_int, zero_one_bfs, dial, radix_dijkstra, integer_dijkstra, DIAL_MAX_COST
+from dijkstra import dijkstra, path_to
+from point_to_point import astar, bidirectional_dijkstra
+from contraction_hierarchies import ContractionHierarchy
+from bellman_ford import spfa, bellman_ford_edges
+from floyd_np import floyd, adjacency_matrix
+from dag import topological_order, dag_paths_from, dag_paths_to, CycleError
 
-sols = sp1, sp2, sp3, sp4, sp5, sp_neg
+sols = (
+    sp1, sp2, sp3, sp4, sp5, sp6, sp_neg, sp_apsp, sp_floyd, sp_johnson, sp_int,
+    lambda n, edges: sp_floyd(n, edges, block=4),
+)
 
 
 def main():
@@ -61,5 +87,254 @@ def main():
 
         assert all(answer == answers[0] for answer in answers)
 
+        # spinning up a process pool is slow, so only check it sometimes
+        if cas % 1000 == 0:
+            assert all_pairs_shortest_paths(n, edges, workers=3, chunksize=1).tolist() == answers[0]
+            assert johnson(n, edges, workers=3).tolist() == answers[0]
+
+        # profiling gives the same answer and consistent counts, and leaves
+        # the module as it was
+        result, prof = profile_call(sp5, n, edges)
+        assert result == answers[0] and sp5.__globals__['heappush'] is heappush
+        assert prof.pushes == prof.pops and prof.pops - prof.stale_pops == sum(d < INF for row in answers[0] for d in row)
+        # every settled node scans its arcs once
+        assert prof.relaxations == sum(sum(edge.i == i for edge in edges) for row in answers[0] for i, d in enumerate(row) if d < INF)
+        assert prof.max_heap <= prof.pushes and set(prof.to_dict()['phases']) == {'build', 'search', 'total'}
+
+        # integer output, with the largest int64 for unreachable pairs
+        ints = all_pairs_shortest_paths(n, edges, workers=1, dtype=np.int64)
+        assert ints.tolist() == [[d if d < INF else np.iinfo(np.int64).max for d in row] for row in answers[0]]
+
+        # batches of sources into integer arrays, and the nearest of several sources
+        sources = [rand.randrange(n) for _ in range(rand.randint(1, n))]
+        batch = all_pairs_shortest_paths(n, edges, sources=sources, workers=1, dtype=np.int64, unreachable=-1)
+        assert batch.dtype == np.int64 and batch.tolist() == [[d if d < INF else -1 for d in answers[0][x]] for x in sources]
+        dists, nearest = nearest_sources(n, edges, sources)
+        for t in range(n):
+            assert dists[t] == min(answers[0][x][t] for x in sources)
+            assert nearest[t] == -1 if dists[t] == INF else nearest[t] in sources and answers[0][nearest[t]][t] == dists[t]
+
+        # stopping early at a set of targets gives the same distances to them,
+        # and the pred array gives paths of that length
+        graph = CSRGraph.from_edges(n, edges, directed=True)
+        x = rand.randrange(n)
+        targets = rand.sample(range(n), rand.randint(0, n))
+        dists, pred = dijkstra(graph, x, targets=targets)
+        for t in targets:
+            assert dists[t] == answers[0][x][t]
+            if dists[t] < INF:
+                path = path_to(pred, t)
+                assert path[0] == x and path[-1] == t
+                assert sum(min(edge.cost for edge in edges if (edge.i, edge.j) == (a, b)) for a, b in zip(path, path[1:])) == dists[t]
+
+        def path_cost(path):
+            return sum(min(edge.cost for edge in edges if (edge.i, edge.j) == (a, b)) for a, b in zip(path, path[1:]))
+
+        # every integer queue, whichever integer_dijkstra would pick
+        sources = rand.sample(range(n), rand.randint(1, n))
+        expected = [min(answers[0][x][t] for x in sources) for t in range(n)]
+        max_cost = max((edge.cost for edge in edges), default=0)
+        for dists, pred in dial(graph, sources, max_cost), radix_dijkstra(graph, sources):
+            assert list(dists) == expected
+            for t in range(n):
+                if dists[t] < INF:
+                    path = path_to(pred, t)
+                    assert path[0] in sources and path_cost(path) == dists[t]
+
+        bits = [Edge(edge.i, edge.j, edge.cost % 2) for edge in edges]
+        bit_graph = CSRGraph.from_edges(n, bits, directed=True)
+        assert zero_one_bfs(bit_graph, sources)[0] == dijkstra(bit_graph, sources)[0]
+
+        # and integer_dijkstra picks one that gives the same answer, for 0-1
+        # costs, small costs, costs past DIAL_MAX_COST, and float costs
+        # (which fall back to the binary heap)
+        assert integer_dijkstra(bit_graph, sources)[0] == dijkstra(bit_graph, sources)[0]
+        assert list(integer_dijkstra(graph, sources)[0]) == expected
+        scale = DIAL_MAX_COST + 1
+        big_graph = CSRGraph.from_edges(n, [Edge(edge.i, edge.j, edge.cost * scale) for edge in edges], directed=True)
+        assert list(integer_dijkstra(big_graph, sources)[0]) == [d * scale for d in expected]
+        float_graph = CSRGraph.from_edges(n, [Edge(edge.i, edge.j, edge.cost / 2) for edge in edges], directed=True)
+        assert list(integer_dijkstra(float_graph, sources)[0]) == [d / 2 for d in expected]
+
+        # dynamic shortest paths, after random insertions and weight changes
+        x = rand.randrange(n)
+        sssp = DynamicSSSP(n, edges, x)
+        cur = [*edges]
+        for _ in range(rand.randint(0, 10)):
+            if not cur or rand.random() < 0.3:
+                cur.append(Edge(rand.randrange(n), rand.randrange(n), rand_cost() - 1))
+                assert sssp.insert_edge(cur[-1]) == len(cur) - 1
+            else:
+                k = rand.randrange(len(cur))
+                # often a tree edge, to make increases repair something
+                if rand.random() < 0.5 and any(e >= 0 for e in sssp.pred_edge):
+                    k = rand.choice([e for e in sssp.pred_edge if e >= 0])
+                cur[k] = Edge(cur[k].i, cur[k].j, max(0, cur[k].cost + rand.randint(-5, 5)))
+                sssp.set_weight(k, cur[k].cost)
+
+            assert sssp.dists == dijkstra(CSRGraph.from_edges(n, cur, directed=True), x)[0]
+            for t in range(n):
+                k = sssp.pred_edge[t]
+                assert (k < 0) == (t == x or sssp.dists[t] == INF)
+                if k >= 0:
+                    assert cur[k].j == t and sssp.pred[t] == cur[k].i and sssp.dists[cur[k].i] + cur[k].cost == sssp.dists[t]
+                    assert t in sssp.children[cur[k].i]
+            assert sum(map(len, sssp.children)) == sum(k >= 0 for k in sssp.pred_edge)
+
+        # k shortest simple paths, against every simple path by brute force
+        s, t = rand.randrange(n), rand.randrange(n)
+        arcs = {}
+        for edge in edges:
+            arcs[edge.i, edge.j] = min(edge.cost, arcs.get((edge.i, edge.j), INF))
+        simple_costs = []
+        def extend(path, cost):
+            if path[-1] == t:
+                simple_costs.append(cost)
+                return
+            for (a, b), c in arcs.items():
+                if a == path[-1] and b not in path:
+                    extend(path + [b], cost + c)
+        if n <= 11:
+            extend([s], 0)
+            k = rand.randint(1, 10)
+            found = [*islice(k_shortest_paths(graph, s, t), k)]
+            assert [cost for cost, _ in found] == sorted(simple_costs)[:k]
+            assert len({tuple(path) for _, path in found}) == len(found)
+            for cost, path in found:
+                assert path[0] == s and path[-1] == t and len(set(path)) == len(path)
+                assert sum(arcs[a, b] for a, b in zip(path, path[1:])) == cost
+
+        # the shortest path tree cache, as the edges change under it
+        cache = ShortestPathCache(max_bytes=rand.choice([0, 100, 1000, 1 << 20]))
+        cur = EdgeList(edges)
+        for _ in range(rand.randint(0, 20)):
+            if rand.random() < 0.2:
+                if cur and rand.random() < 0.5:
+                    k = rand.randrange(len(cur))
+                    cur[k] = Edge(cur[k].i, cur[k].j, rand_cost())
+                else:
+                    cur.append(Edge(rand.randrange(n), rand.randrange(n), rand_cost()))
+            x = rand.randrange(n)
+            assert cache.dists_from(n, cur, x) == dijkstra(CSRGraph.from_edges(n, cur, directed=True), x)[0]
+            assert cache.nbytes <= cache.max_bytes
+            assert all(fingerprint == (cur.token, cur.version, n) for fingerprint, _ in cache.trees)
+        # the same EdgeList with more nodes is a different graph
+        x = rand.randrange(n + 1)
+        assert cache.dists_from(n + 1, cur, x) == dijkstra(CSRGraph.from_edges(n + 1, cur, directed=True), x)[0]
+        assert len(cache.dists_from(n + 1, cur, 0)) == n + 1 and len(cache.dists_from(n, cur, 0)) == n
+        assert cache.shortest_paths_from(n, edges, 0) == answers[0][0]
+
+        # plain lists are fingerprinted by their content
+        assert graph_fingerprint(n, edges) == graph_fingerprint(n, [Edge(edge.i, edge.j, edge.cost) for edge in edges])
+        assert graph_fingerprint(n, edges) != graph_fingerprint(n + 1, edges)
+        if edges:
+            k = rand.randrange(len(edges))
+            changed = [*edges]
+            changed[k] = Edge(edges[k].i, edges[k].j, edges[k].cost + rand.choice([1, 0.5]))
+            assert graph_fingerprint(n, edges) != graph_fingerprint(n, changed)
+
+        # point-to-point queries
+        rgraph = graph.reverse()
+        s, t = rand.randrange(n), rand.randrange(n)
+        scale = rand.random()
+        for dist, path, settled in (
+                astar(graph, s, t),
+                # any heuristic below the true distance is admissible
+                astar(graph, s, t, lambda i: scale * answers[0][i][t] if answers[0][i][t] < INF else 0),
+                bidirectional_dijkstra(graph, rgraph, s, t),
+            ):
+            assert dist == answers[0][s][t]
+            if dist < INF:
+                assert path[0] == s and path[-1] == t and path_cost(path) == dist
+            else:
+                assert path == []
+
+        # contraction hierarchies, with witness searches cut short sometimes
+        ch = ContractionHierarchy.build(n, edges, witness_limit=rand.choice([1, 3, 100]))
+        for _ in range(5):
+            s, t = rand.randrange(n), rand.randrange(n)
+            dist, path = ch.query(s, t)
+            assert dist == answers[0][s][t]
+            if dist < INF:
+                assert path[0] == s and path[-1] == t and path_cost(path) == dist
+
+        # and the same answers after a round trip through a file
+        with tempfile.TemporaryDirectory() as dirname:
+            ch.save(os.path.join(dirname, 'ch.bin'))
+            loaded = ContractionHierarchy.load(os.path.join(dirname, 'ch.bin'))
+        for _ in range(5):
+            s, t = rand.randrange(n), rand.randrange(n)
+            assert loaded.query(s, t) == ch.query(s, t)
+
+        # bellman-ford, with some costs made negative
+        neg_edges = [Edge(edge.i, edge.j, edge.cost - rand.randint(0, edge.cost + 3)) for edge in edges]
+        neg_dists, _ = floyd(adjacency_matrix(n, neg_edges))
+        s = rand.randrange(n)
+        if not any(neg_dists[v][v] < 0 for v in range(n)):
+            assert sp_neg(n, neg_edges) == neg_dists.tolist()
+            assert sp_johnson(n, neg_edges) == neg_dists.tolist()
+        else:
+            try:
+                sp_johnson(n, neg_edges)
+                assert False
+            except NegativeCycle:
+                pass
+        reaches_neg_cycle = any(neg_dists[s][v] < INF and neg_dists[v][v] < 0 for v in range(n))
+        for ok, dists, pred in (
+                spfa(CSRGraph.from_edges(n, neg_edges, directed=True), s),
+                bellman_ford_edges(n, [e.i for e in neg_edges], [e.j for e in neg_edges], [e.cost for e in neg_edges], s),
+            ):
+            assert ok == (not reaches_neg_cycle)
+            if ok:
+                assert list(dists) == neg_dists[s].tolist()
+            else:
+                # dists is the negative cycle
+                cycle = dists
+                assert sum(min(e.cost for e in neg_edges if (e.i, e.j) == (a, b)) for a, b in zip(cycle, cycle[1:] + cycle[:1])) < 0
+
+        # topological order exactly when there's no cycle, which is when no
+        # edge goes back to a node that reaches it
+        has_cycle = any(answers[0][edge.j][edge.i] < INF for edge in edges)
+        try:
+            order = topological_order(graph)
+            assert not has_cycle
+            pos = {v: k for k, v in enumerate(order)}
+            assert sorted(order) == [*range(n)] and all(pos[edge.i] < pos[edge.j] for edge in edges)
+        except CycleError as e:
+            assert has_cycle
+            cycle = e.cycle
+            assert all(any((edge.i, edge.j) == (a, b) for edge in edges) for a, b in zip(cycle, cycle[1:] + cycle[:1]))
+
+        # DAG paths, on the graph with every edge pointed forward along a random order
+        rank = rand.shuffled(range(n))
+        dag_edges = [Edge(*sorted((edge.i, edge.j), key=rank.__getitem__), edge.cost) for edge in neg_edges if edge.i != edge.j]
+        dag = CSRGraph.from_edges(n, dag_edges, directed=True)
+        shortest, _ = floyd(adjacency_matrix(n, dag_edges))
+        longest, _ = floyd(adjacency_matrix(n, [Edge(edge.i, edge.j, -edge.cost) for edge in dag_edges]))
+        for sign, mat, is_longest in (1, shortest, False), (-1, longest, True):
+            dists, pred = dag_paths_from(dag, s, longest=is_longest)
+            assert list(dists) == [sign*d for d in mat[s]]
+            for t in range(n):
+                if t != s and abs(dists[t]) < INF:
+                    path = [t]
+                    while path[-1] != s:
+                        path.append(pred[path[-1]])
+                    assert sum(min((e.cost for e in dag_edges if (e.j, e.i) == (a, b)), key=sign.__mul__) for a, b in zip(path, path[1:])) == dists[t]
+
+            dests = rand.sample(range(n), rand.randint(0, n))
+            for t, dists in zip(dests, dag_paths_to(dag, dests, longest=is_longest)):
+                assert list(dists) == [sign*mat[i][t] for i in range(n)]
+
+        # the CSR view has the same adjacency lists
+        for directed in False, True:
+            adj = make_adjacency_list(n, edges, directed=directed)
+            graph = CSRGraph.from_edges(n, edges, directed=directed)
+            assert [graph[i] for i in range(n)] == adj
+            assert all(a is b for i in range(n) for (*_, a), (*_, b) in zip(graph[i], adj[i]))
+
+            rgraph = graph.reverse()
+            radj = make_adjacency_list(n, [Edge(edge.j, edge.i, edge.cost) for edge in edges], directed=directed)
+            assert [sorted((j, c) for j, c, _ in rgraph[i]) for i in range(n)] == [sorted((j, c) for j, c, _ in radj[i]) for i in range(n)]
+
 if __name__ == '__main__':
     main()
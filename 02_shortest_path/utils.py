@@ -1,3 +1,4 @@
+from array import array
 from collections.abc import Sequence
 
 from dataclasses import dataclass
@@ -21,6 +22,77 @@ class CS33Random(Random):
         return seq
 
 
+class IndexedHeap:
+    # binary min-heap over the items 0..n-1 that supports decrease-key,
+    # so it never holds more than one entry per item
+    def __init__(self, n):
+        self.heap = []
+        self.pos = array('i', [-1])*n
+        self.key = [None]*n
+        super().__init__()
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, v):
+        return self.pos[v] >= 0
+
+    def push(self, v, key):
+        # insert v, or decrease its key if it's already in the heap.
+        # returns True if the key of v changed, false otherwise
+        if self.pos[v] < 0:
+            self.key[v] = key
+            self.pos[v] = len(self.heap)
+            self.heap.append(v)
+        elif key < self.key[v]:
+            self.key[v] = key
+        else:
+            return False
+
+        self._sift_up(self.pos[v])
+        return True
+
+    def pop(self):
+        heap = self.heap
+        v = heap[0]
+        last = heap.pop()
+        self.pos[v] = -1
+        if heap:
+            heap[0] = last
+            self.pos[last] = 0
+            self._sift_down(0)
+        return self.key[v], v
+
+    def _sift_up(self, loc):
+        heap, pos, key = self.heap, self.pos, self.key
+        v = heap[loc]
+        while loc > 0:
+            parent = (loc - 1) // 2
+            if key[heap[parent]] > key[v]:
+                heap[loc] = heap[parent]
+                pos[heap[loc]] = loc
+                loc = parent
+            else:
+                break
+        heap[loc] = v
+        pos[v] = loc
+
+    def _sift_down(self, loc):
+        heap, pos, key = self.heap, self.pos, self.key
+        v = heap[loc]
+        while (son := loc * 2 + 1) < len(heap):
+            if son + 1 < len(heap) and key[heap[son + 1]] < key[heap[son]]:
+                son += 1
+            if key[v] > key[heap[son]]:
+                heap[loc] = heap[son]
+                pos[heap[loc]] = loc
+                loc = son
+            else:
+                break
+        heap[loc] = v
+        pos[v] = loc
+
+
 def make_adjacency_list(n: int, edges: Sequence[Edge], *, directed=False) -> list[list[tuple[int, int, Edge]]]:
     adj = [[] for _ in range(n)]
 
@@ -47,3 +119,107 @@ def make_adjacency_matrix(n: int, edges: Sequence[Edge], *, directed=False):
             add_edge(edge.j, edge.i, edge.cost, edge)
 
     return mat
+
+
+def _cost_array(costs):
+    # int64 if all costs are ints, float64 if some aren't, None if the graph is unweighted
+    costs = [*costs]
+    if costs and all(cost is None for cost in costs):
+        return None
+    try:
+        return array('q', costs)
+    except TypeError:
+        return array('d', costs)
+
+
+class CSRGraph:
+    # adjacency in compressed sparse row form. the arcs out of node i are the
+    # k in range(indptr[i], indptr[i + 1]): arc k goes to indices[k], costs
+    # weights[k], and comes from edges[edge_id[k]]. that's a few machine words
+    # per arc, instead of a tuple and an Edge reference.
+    #
+    # graph[i] is the same list of (j, cost, edge) that make_adjacency_list
+    # gives, in the same order, so code written against adjacency lists runs
+    # on it unchanged. neighbors(i) and costs(i) are zero-copy slices.
+    def __init__(self, indptr, indices, weights, edge_id, edges=None):
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.edge_id = edge_id
+        self.edges = edges
+        super().__init__()
+
+    @classmethod
+    def from_arrays(cls, n: int, i, j, cost=None, *, directed=False, edges=None):
+        # bulk build from parallel arrays i, j, cost (one entry per edge)
+        m = len(i)
+
+        # counting sort of the arcs by their tail. an undirected edge is an
+        # arc each way, added right after each other like make_adjacency_list
+        indptr = array('i', [0])*(n + 1)
+        for t in range(m):
+            indptr[i[t] + 1] += 1
+            if not directed:
+                indptr[j[t] + 1] += 1
+        for x in range(n):
+            indptr[x + 1] += indptr[x]
+
+        fill = indptr[:-1]
+        indices = array('i', [0])*indptr[n]
+        edge_id = array('i', [0])*indptr[n]
+
+        def add_arc(a, b, t):
+            k = fill[a]
+            fill[a] += 1
+            indices[k] = b
+            edge_id[k] = t
+
+        for t in range(m):
+            add_arc(i[t], j[t], t)
+            if not directed:
+                add_arc(j[t], i[t], t)
+
+        weights = None if cost is None else _cost_array(cost[t] for t in edge_id)
+
+        return cls(indptr, indices, weights, edge_id, edges)
+
+    @classmethod
+    def from_edges(cls, n: int, edges: Sequence[Edge], *, directed=False):
+        return cls.from_arrays(n,
+                array('i', (edge.i for edge in edges)),
+                array('i', (edge.j for edge in edges)),
+                [edge.cost for edge in edges],
+                directed=directed, edges=edges)
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    def __getitem__(self, i):
+        # compatibility view: the (j, cost, edge) list of make_adjacency_list
+        lo, hi = self.indptr[i], self.indptr[i + 1]
+        costs = self.costs(i) if self.weights is not None else [None]*(hi - lo)
+        edges = [self.edges[t] for t in self.edge_id[lo:hi]] if self.edges is not None else self.edge_id[lo:hi]
+        return [*zip(self.indices[lo:hi], costs, edges)]
+
+    def neighbors(self, i):
+        return memoryview(self.indices)[self.indptr[i]:self.indptr[i + 1]]
+
+    def costs(self, i):
+        return memoryview(self.weights)[self.indptr[i]:self.indptr[i + 1]]
+
+    def arc_ids(self, i):
+        return memoryview(self.edge_id)[self.indptr[i]:self.indptr[i + 1]]
+
+    def reverse(self):
+        # the same graph with every arc flipped
+        n = len(self)
+        tails = array('i', [0])*len(self.indices)
+        for i in range(n):
+            for k in range(self.indptr[i], self.indptr[i + 1]):
+                tails[k] = i
+
+        graph = CSRGraph.from_arrays(n, self.indices, tails, self.weights, directed=True)
+        # from_arrays numbered the arcs, point them back at the edges
+        graph.edge_id = array('i', (self.edge_id[k] for k in graph.edge_id))
+        graph.edges = self.edges
+        return graph
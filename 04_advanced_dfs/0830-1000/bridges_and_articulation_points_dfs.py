@@ -1,11 +1,11 @@
-from utils import make_adjacency_list, Edge
+from utils import CSRGraph, Edge
 
 
 def bridges_and_articulation_points(n, edges):
 
     # assert is_connected(n, edges)
 
-    adj = make_adjacency_list(n, edges)
+    graph = CSRGraph.from_edges(n, edges)
 
     vis = [-1]*n
     low = [-1]*n
@@ -20,6 +20,7 @@ def bridges_and_articulation_points(n, edges):
     bridges = []
     artic_points = []
     def dfs(i, parent_edge):
+        # parent_edge is the index into edges of the tree edge into i
         visit(i)
 
         is_root = parent_edge is None
@@ -28,7 +29,7 @@ def bridges_and_articulation_points(n, edges):
 
         found_isolated_child = False
         children = 0
-        for j, *_, edge in adj[i]:
+        for j, edge in zip(graph.neighbors(i), graph.arc_ids(i)):
 
             if vis[j] == -1:
                 # tree edge
@@ -39,12 +40,12 @@ def bridges_and_articulation_points(n, edges):
 
                 if low[j] > vis[i]:
                     # this is a bridge
-                    bridges.append(edge)
+                    bridges.append(edges[edge])
 
                 if low[j] >= vis[i]:
                     found_isolated_child = True
 
-            elif edge is not parent_edge:
+            elif edge != parent_edge:
                 # back edge
                 low[i] = min(low[i], vis[j])
 
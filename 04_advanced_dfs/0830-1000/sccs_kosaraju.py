@@ -1,15 +1,15 @@
 from itertools import product
 
-from utils import Edge, make_adjacency_list
+from utils import Edge, CSRGraph
 
 def sccs(n, edges):
-    adj = make_adjacency_list(n, edges, directed=True)
+    adj = CSRGraph.from_edges(n, edges, directed=True)
 
     vis = [False]*n
     def dfs(i, adj, stack):
         assert not vis[i]
         vis[i] = True
-        for j, *_ in adj[i]:
+        for j in adj.neighbors(i):
             if not vis[j]:
                 dfs(j, adj, stack)
 
@@ -29,10 +29,7 @@ def sccs(n, edges):
     # - ^ keep track of finishing times
 
     # - reverse the graph
-    jda = make_adjacency_list(n, [
-            Edge(edge.j, edge.i)
-            for edge in edges
-        ], directed=True)
+    jda = adj.reverse()
 
     vis = [False]*n
     # - for each node x in DECREASING finishing time:
@@ -1,4 +1,4 @@
-from utils import Edge, CS33Random
+from utils import Edge, CS33Random, CSRGraph, make_adjacency_list
 
 
 from bridges_and_articulation_points_brute import bridges_and_articulation_points as cut_brute
@@ -52,6 +52,12 @@ def main():
 
             assert all(answer == answers[0] for answer in answers)
 
+            # the CSR view has the same adjacency lists, down to the edge objects
+            graph = CSRGraph.from_edges(n, edges)
+            adj = make_adjacency_list(n, edges)
+            assert [graph[i] for i in range(n)] == adj
+            assert all(a is b for i in range(n) for (*_, a), (*_, b) in zip(graph[i], adj[i]))
+
 
         def test_sccs():
             # test SCCs